@@ -0,0 +1,42 @@
+"""
+🖋️ ANSWER HTML
+Answers rendered from Markdown to sanitized HTML once, then served from memory
+Cached by the answer's content hash, so an edited answer is re-rendered and nothing else
+"""
+
+from answer_store import answer_digest
+from cache import LRUCache
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:  # without markdown-it-py the app shows the raw Markdown, as before
+    MarkdownIt = None
+
+HAVE_MARKDOWN = MarkdownIt is not None
+
+HTML_CACHE_SIZE = 512  # rendered answers kept in memory - the whole knowledge base fits
+HTML_CACHE = LRUCache(maxsize=HTML_CACHE_SIZE)
+
+# CommonMark plus GFM tables, like st.markdown. Raw HTML in an answer is escaped
+# and javascript:/data: links are dropped, so the output is safe to show unescaped.
+_RENDERER = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"]) if HAVE_MARKDOWN else None
+
+
+def markdown_to_html(text: str) -> str:
+    """Sanitized HTML for a Markdown answer (not cached)."""
+    return _RENDERER.render(text).strip()
+
+
+def answer_html(text: str, digest: str = None):
+    """Cached HTML for an answer, or None if markdown-it-py is not installed.
+
+    digest is the answer's content hash (answer_digest), if the caller already has it.
+    """
+    if not HAVE_MARKDOWN or text is None:
+        return None
+    digest = digest or answer_digest(text)
+    html = HTML_CACHE.get(digest)
+    if html is None:
+        html = markdown_to_html(text)
+        HTML_CACHE.set(digest, html)
+    return html
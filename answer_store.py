@@ -0,0 +1,139 @@
+"""
+📦 COMPILED ANSWER STORE
+All answers in one file: a small index up front, zlib-compressed bodies after it
+Only the index is read at startup - bodies are decompressed from an mmap on demand
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import MutableMapping
+from pathlib import Path
+
+from cache import LRUCache
+
+MAGIC = b"TGTA-STORE-1\n"
+_HEADER_SIZE = struct.Struct("<Q")
+
+HOT_CACHE_SIZE = 64  # decompressed answers kept in memory per store
+
+
+def answer_digest(body: str) -> str:
+    """Short content hash of an answer body."""
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def build_store(path: Path, answers: dict, keywords: dict, fingerprint=(), term_counts: dict = None):
+    """Write answers (plus keywords and optional per-answer term counts) to a store file.
+
+    The file is written next to path and renamed into place, so a store that
+    is open in another process is never seen half-written.
+    """
+    path = Path(path)
+    entries, blobs, offset = [], [], 0
+    for key, body in answers.items():
+        blob = zlib.compress(body.encode("utf-8"), 6)
+        entry = {"key": key, "offset": offset, "length": len(blob), "digest": answer_digest(body)}
+        if term_counts is not None:
+            entry["terms"] = dict(term_counts[key])
+        entries.append(entry)
+        blobs.append(blob)
+        offset += len(blob)
+
+    index = json.dumps({
+        "fingerprint": [list(item) for item in fingerprint],
+        "keywords": dict(keywords),
+        "entries": entries,
+    }, ensure_ascii=False).encode("utf-8")
+
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_SIZE.pack(len(index)))
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+class AnswerStore(MutableMapping):
+    """Answers read lazily from a compiled store file.
+
+    Behaves like the QUICK_ANSWERS dict: iteration keeps the original order,
+    and setting or deleting a key only changes this process's view (and bumps
+    .version like a VersionedDict). The file itself is never modified.
+    """
+
+    def __init__(self, path: Path, hot_cache_size: int = HOT_CACHE_SIZE):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not an answer store")
+        start = len(MAGIC)
+        (index_size,) = _HEADER_SIZE.unpack_from(self._mmap, start)
+        start += _HEADER_SIZE.size
+        index = json.loads(self._mmap[start:start + index_size].decode("utf-8"))
+        self._base = start + index_size
+
+        self.fingerprint = tuple(tuple(item) for item in index["fingerprint"])
+        self.keywords = index["keywords"]
+        self._entries = {e["key"]: e for e in index["entries"]}
+        self._overrides = {}
+        self._hot = LRUCache(maxsize=hot_cache_size)
+        self.version = 0
+
+    # ----- the stored data -----
+
+    def digest(self, key: str) -> str:
+        if key in self._overrides:
+            return answer_digest(self._overrides[key])
+        return self._entries[key]["digest"]
+
+    def term_counts(self, key: str):
+        """Term counts saved at build time, or None if the answer was changed since."""
+        if key in self._overrides:
+            return None
+        return self._entries[key].get("terms")
+
+    def _read(self, entry: dict) -> str:
+        start = self._base + entry["offset"]
+        return zlib.decompress(self._mmap[start:start + entry["length"]]).decode("utf-8")
+
+    # ----- mapping protocol -----
+
+    def __getitem__(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+        entry = self._entries[key]
+        body = self._hot.get(key)
+        if body is None:
+            body = self._read(entry)
+            self._hot.set(key, body)
+        return body
+
+    def __setitem__(self, key, value):
+        self._overrides[key] = value
+        self._entries.setdefault(key, {"key": key})
+        self.version += 1
+
+    def __delitem__(self, key):
+        del self._entries[key]
+        self._overrides.pop(key, None)
+        self._hot.clear()
+        self.version += 1
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __repr__(self):
+        return f"AnswerStore({str(self.path)!r}, {len(self)} answers)"
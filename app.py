@@ -9,23 +9,53 @@ import streamlit as st
 import streamlit.components.v1 as components
 from pathlib import Path
 from datetime import datetime
-import requests
 import base64
 import random
+import time
 import urllib.parse
+from contextlib import nullcontext
 
 # Path setup
 ASSETS_PATH = Path(__file__).parent / "assets"
 
 # Import Knowledge Base
 try:
-    from knowledge_base import QUICK_ANSWERS, get_smart_answer, get_suggestions
+    from knowledge_base import (add_completions, autocomplete, correct_query, get_answer, get_answer_html,
+                                get_related, normalize_query, rank_answers, watch_knowledge_base)
     KB_LOADED = True
 except ImportError:
     KB_LOADED = False
-    QUICK_ANSWERS = {}
-    def get_smart_answer(q): return {"answer": None, "confidence": 0}
-    def get_suggestions(q): return []
+    def add_completions(pairs, priority=2): pass
+    def autocomplete(prefix, k=5): return []
+    def get_answer(key): return None
+    def get_answer_html(key): return None
+    def correct_query(q): return q
+    def normalize_query(q): return q
+    def get_related(key, k=3): return []
+    def rank_answers(q, k=5): return []
+
+# Weather and exchange rates, kept fresh in the background (live_data.py)
+from http_client import CLIENT as HTTP_CLIENT
+from live_data import get_rates, get_weather, start_refresher
+
+# Wikipedia fallback for questions the knowledge base can't answer
+try:
+    from wiki import search_gambia_wikipedia, start_snapshot_refresher
+except ImportError:
+    def search_gambia_wikipedia(query): return {"success": False, "title": query, "summary": "", "url": "", "image": ""}
+    start_snapshot_refresher = None
+
+# Match tracing for the hidden debug panel on the results page (?debug=1)
+try:
+    from tracing import trace_matches
+except ImportError:
+    trace_matches = None
+
+# Query log - which searches the knowledge base missed (see tools/kb_gap_report.py)
+try:
+    from query_log import QUERY_LOG
+except ImportError:
+    QUERY_LOG = None
 
 # Page config
 st.set_page_config(
@@ -35,6 +65,28 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Reload knowledge/ edits in the background - one watcher per server process
+@st.cache_resource
+def start_knowledge_watcher():
+    return watch_knowledge_base() if KB_LOADED else None
+
+start_knowledge_watcher()
+
+# Keep the local Wikipedia snapshot complete and fresh - searches never wait on Wikipedia
+@st.cache_resource
+def start_wiki_refresher():
+    return start_snapshot_refresher() if start_snapshot_refresher else None
+
+start_wiki_refresher()
+
+# Refresh weather and exchange rates before they expire - pages never wait on Open-Meteo or Frankfurter.
+# The same thread writes out partial query log batches, so quiet spells and restarts don't lose them.
+@st.cache_resource
+def start_live_data_refresher():
+    return start_refresher(tasks=(QUERY_LOG.flush_due,) if QUERY_LOG is not None else ())
+
+start_live_data_refresher()
+
 # Colors - Gambian Flag
 RED = "#CE1126"
 BLUE = "#0C1C8C"
@@ -166,70 +218,21 @@ header[data-testid="stHeader"] {background: transparent !important;}
 
 # ============== API FUNCTIONS ==============
 
-@st.cache_data(ttl=1800)
 def get_live_weather():
-    """Get live weather for Banjul."""
-    try:
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {"latitude": 13.4549, "longitude": -16.5790,
-                  "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m", "timezone": "GMT"}
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 200:
-            c = r.json().get("current", {})
-            return {"temperature": c.get("temperature_2m", 28), "humidity": c.get("relative_humidity_2m", 70),
-                    "wind_speed": c.get("wind_speed_10m", 15), "weather_code": c.get("weather_code", 0), "success": True}
-    except: pass
-    return {"success": False, "temperature": 28, "humidity": 70, "wind_speed": 15, "weather_code": 0}
-
-@st.cache_data(ttl=3600)
+    """Get live weather and the 7-day forecast for Banjul (last good value, never blocks)."""
+    return get_weather()
+
 def get_exchange_rates():
-    """Get exchange rates."""
-    try:
-        r = requests.get("https://api.frankfurter.app/latest?from=EUR&to=USD,GBP", timeout=10)
-        if r.status_code == 200:
-            rates = r.json().get("rates", {})
-            gmd = 70.0
-            return {"EUR": {"rate": gmd, "symbol": "€"}, "USD": {"rate": gmd/rates.get("USD", 1.1), "symbol": "$"},
-                    "GBP": {"rate": gmd/rates.get("GBP", 0.85), "symbol": "£"}, "success": True}
-    except: pass
-    return {"EUR": {"rate": 70, "symbol": "€"}, "USD": {"rate": 65, "symbol": "$"}, "GBP": {"rate": 82, "symbol": "£"}, "success": False}
-
-@st.cache_data(ttl=86400)
-def search_gambia_wikipedia(query: str):
-    """Search Wikipedia for Gambia-related topics."""
-    GAMBIA_WIKI_MAP = {
-        "serekunda": "Serekunda", "bakau": "Bakau", "brikama": "Brikama",
-        "banjul": "Banjul", "kololi": "Kololi", "kotu": "Kotu_Stream",
-        "bijilo": "Bijilo", "brufut": "Brufut", "gunjur": "Gunjur", "sanyang": "Sanyang",
-        "soma": "Soma,_Gambia", "farafenni": "Farafenni", "basse": "Basse_Santa_Su",
-        "janjanbureh": "Janjanbureh", "kunta kinteh": "Kunta_Kinte", "kunta kinte": "Kunta_Kinte",
-        "kunta kinteh island": "Kunta_Kinteh_Island", "james island": "Kunta_Kinteh_Island",
-        "gambia river": "Gambia_River", "history": "History_of_the_Gambia",
-        "mandinka": "Mandinka_people", "wolof": "Wolof_people", "fula": "Fula_people",
-        "tourism": "Tourism_in_the_Gambia", "culture": "Culture_of_the_Gambia",
-        "abuko": "Abuko_Nature_Reserve", "makasutu": "Makasutu_Culture_Forest",
-        "stone circles": "Stone_Circles_of_Senegambia", "wassu": "Wassu_Stone_Circles",
-        "gambia": "The_Gambia", "the gambia": "The_Gambia",
-    }
-    q_lower = query.lower().strip()
-    
-    for key, article in GAMBIA_WIKI_MAP.items():
-        if key in q_lower or q_lower in key:
-            try:
-                url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{article}"
-                r = requests.get(url, headers={"User-Agent": "GambiaTravelAssistant/1.0"}, timeout=10)
-                if r.status_code == 200:
-                    data = r.json()
-                    return {
-                        "title": data.get("title", article.replace("_", " ")),
-                        "summary": data.get("extract", ""),
-                        "url": data.get("content_urls", {}).get("desktop", {}).get("page", f"https://en.wikipedia.org/wiki/{article}"),
-                        "image": data.get("thumbnail", {}).get("source", ""),
-                        "success": True
-                    }
-            except: pass
-    
-    return {"success": False, "title": query, "summary": "", "url": "", "image": ""}
+    """Get exchange rates (last good value, never blocks)."""
+    return get_rates()
+
+def format_age(seconds) -> str:
+    """'just now', '12 min ago', '3 h ago' for a value's age in seconds."""
+    if seconds is None or seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{seconds // 60:.0f} min ago"
+    return f"{seconds // 3600:.0f} h ago"
 
 def get_weather_icon(code: int) -> str:
     icons = {0: "☀️", 1: "⛅", 2: "⛅", 3: "⛅", 45: "🌫️", 48: "🌫️", 51: "🌧️", 53: "🌧️", 55: "🌧️",
@@ -518,6 +521,68 @@ REVIEWS = [
     {"type": "attraction", "item": "Abuko Nature Reserve", "rating": 5, "author": "Peter K.", "date": "Nov 2025", "text": "So many animals! Saw crocodiles, monkeys, and countless birds. Great for families.", "verified": True},
 ]
 
+# ============== SEARCH AUTOCOMPLETE ==============
+ALL_TOP_QUERIES = [
+    ("Is Gambia safe?", "is gambia safe"), ("Do I need visa?", "visa"), ("Best time to visit?", "best time to visit"),
+    ("Day trip ideas", "day trip"), ("How far is Basse?", "how far"), ("Coming from Senegal", "from senegal"),
+    ("Best beaches", "best beach"), ("Best hotels", "best hotel"), ("Where to stay?", "where to stay"),
+    ("Kunta Kinteh Island", "kunta kinteh"), ("Things to do", "things to do"), ("What to see?", "things to do"),
+    ("Currency & money", "money"), ("Getting around", "getting around"), ("Local food", "food"),
+    ("History of Gambia", "history"), ("Culture & people", "culture"),
+    ("Serekunda", "serekunda"), ("Banjul", "banjul"), ("Kololi", "kololi"),
+]
+
+# Hotel, attraction and guide names open their own page - the knowledge base has no answer for most of them
+CATALOG_PAGES = {item["name"]: page for page, items in (("hotels", HOTELS), ("attractions", ATTRACTIONS),
+                                                        ("tour_guides", TOUR_GUIDES)) for item in items}
+
+# Popular questions first, then knowledge base keys, then catalog names - once per server process
+@st.cache_resource
+def register_search_completions():
+    add_completions(ALL_TOP_QUERIES, priority=0)
+    add_completions([(name, name) for name in CATALOG_PAGES], priority=2)
+    return True
+
+register_search_completions()
+
+def live_text_input(label, **kwargs):
+    """A text input that reruns after each typing pause; a plain one on Streamlit versions without live inputs."""
+    try:
+        return st.text_input(label, live=True, **kwargs)
+    except TypeError:
+        return st.text_input(label, **kwargs)
+
+# Only the search box reruns while typing, not the whole page
+@(getattr(st, "fragment", None) or (lambda func: func))
+def home_search_box():
+    query = live_text_input("Search", key="home_search", placeholder="Ask about places, history, culture, travel...", label_visibility="collapsed")
+    
+    for idx, (label, search_term) in enumerate(autocomplete(query) if query else []):
+        if search_term in CATALOG_PAGES:
+            if st.button(f"📍 {label}", key=f"complete_{idx}", use_container_width=True):
+                st.session_state.catalog_item = search_term
+                st.session_state.page = CATALOG_PAGES[search_term]
+                st.rerun()
+        elif st.button(f"🔎 {label[:1].upper()}{label[1:]}", key=f"complete_{idx}", use_container_width=True):
+            st.session_state.search_query = search_term
+            st.session_state.page = "results"
+            st.rerun()
+    
+    if st.button("🔍 Search", use_container_width=True, type="primary"):
+        if query:
+            st.session_state.search_query = query
+            st.session_state.page = "results"
+            st.rerun()
+
+# ============== ANSWER RENDERING ==============
+def show_answer(key, text):
+    """Show a knowledge base answer from the pre-rendered HTML cache, or as Markdown if it isn't available."""
+    html = get_answer_html(key)
+    if html:
+        st.markdown(html, unsafe_allow_html=True)
+    else:
+        st.markdown(text)
+
 # ============== SESSION STATE ==============
 if "page" not in st.session_state: st.session_state.page = "home"
 
@@ -644,23 +709,35 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Weather with loading indicator
-    with st.spinner("🌤️"):
-        w = get_live_weather()
+    # Weather and rates are the last good values - no loading wait
+    w = get_live_weather()
     icon = get_weather_icon(w.get("weather_code", 0))
     if w.get("success"):
-        st.markdown(f"**{icon} {w.get('temperature', 28)}°C** Banjul")
+        st.markdown(f"**{icon} {w.get('temperature', 28)}°C** Banjul" + (f" _({format_age(w['age'])})_" if w.get("stale") else ""))
     else:
         st.markdown(f"**{icon} ~28°C** Banjul _(offline)_")
     
-    # Exchange rates with loading indicator
-    with st.spinner("💵"):
-        r = get_exchange_rates()
+    r = get_exchange_rates()
     if r.get("success"):
-        st.markdown(f"**💵 {r['USD']['rate']:.0f} GMD** per $1")
+        st.markdown(f"**💵 {r['USD']['rate']:.0f} GMD** per $1" + (f" _({format_age(r['age'])})_" if r.get("stale") else ""))
     else:
         st.markdown(f"**💵 ~65 GMD** per $1 _(offline)_")
     
+    # Hidden upstream health panel (?debug=1) - breaker state, errors and latency per API
+    if getattr(st, "query_params", {}).get("debug") == "1":
+        with st.expander("🔧 Upstream health"):
+            upstreams = HTTP_CLIENT.stats()["upstreams"]
+            if upstreams:
+                st.table([
+                    {"upstream": name, "breaker": h.get("breaker", {}).get("state", "closed"), "ok": h.get("ok", 0),
+                     "failed": h.get("failed", 0), "fast-failed": h.get("short_circuited", 0),
+                     "p95 ms": (h.get("latency") or {}).get("p95_ms")}
+                    for name, h in sorted(upstreams.items())
+                ])
+            else:
+                st.caption("No upstream calls yet")
+            st.code(HTTP_CLIENT.metrics_text(), language=None)
+    
     st.markdown("---")
     st.markdown("**🚨 Emergency**")
     st.markdown("🚔 Police: **117**")
@@ -681,23 +758,7 @@ if page == "home":
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        query = st.text_input("Search", key="home_search", placeholder="Ask about places, history, culture, travel...", label_visibility="collapsed")
-        
-        if st.button("🔍 Search", use_container_width=True, type="primary"):
-            if query:
-                st.session_state.search_query = query
-                st.session_state.page = "results"
-                st.rerun()
-    
-    ALL_TOP_QUERIES = [
-        ("Is Gambia safe?", "is gambia safe"), ("Do I need visa?", "visa"), ("Best time to visit?", "best time to visit"),
-        ("Day trip ideas", "day trip"), ("How far is Basse?", "how far"), ("Coming from Senegal", "from senegal"),
-        ("Best beaches", "best beach"), ("Best hotels", "best hotel"), ("Where to stay?", "where to stay"),
-        ("Kunta Kinteh Island", "kunta kinteh"), ("Things to do", "things to do"), ("What to see?", "things to do"),
-        ("Currency & money", "money"), ("Getting around", "getting around"), ("Local food", "food"),
-        ("History of Gambia", "history"), ("Culture & people", "culture"),
-        ("Serekunda", "serekunda"), ("Banjul", "banjul"), ("Kololi", "kololi"),
-    ]
+        home_search_box()
     
     st.markdown("")
     st.markdown("<p style='text-align:center; color:#888; margin-bottom:1rem;'>🔥 Popular questions tourists ask:</p>", unsafe_allow_html=True)
@@ -735,18 +796,48 @@ elif page == "results":
     
     st.markdown("---")
     
-    # Try Knowledge Base first
+    # Fix obvious typos ("makasuto" -> "makasutu") before searching anything
+    corrected = correct_query(query) if KB_LOADED else query
+    if corrected != normalize_query(query):
+        st.caption(f"Showing results for **{corrected}**")
+    
+    # Try Knowledge Base first - best answer plus a few runners-up
     kb_result = None
-    if KB_LOADED:
-        kb_result = get_smart_answer(query)
+    debug = trace_matches is not None and getattr(st, "query_params", {}).get("debug") == "1"
+    match_start = time.perf_counter()
+    with (trace_matches() if debug else nullcontext([])) as traces:
+        ranked = rank_answers(query, k=4) if KB_LOADED else []
+    match_ms = (time.perf_counter() - match_start) * 1000
+    if ranked:
+        kb_result = ranked[0]
+    
+    # One log record per search, not per rerun of the results page
+    log_search = QUERY_LOG is not None and st.session_state.get("logged_search") != query
+    if log_search:
+        st.session_state.logged_search = query
     
     if kb_result and kb_result.get("answer") and kb_result.get("confidence", 0) >= 0.5:
+        if log_search:
+            QUERY_LOG.record(corrected, kb_result["tier"], kb_result["confidence"], match_ms, matched=kb_result["matched"])
+        
         title = query.title() if len(query) < 50 else kb_result.get("matched", query).replace("_", " ").title()
         
         st.markdown(f"## {title}")
-        st.markdown(kb_result["answer"])
+        show_answer(kb_result["matched"], kb_result["answer"])
         
-        suggestions = get_suggestions(query) if KB_LOADED else []
+        alternatives = [r["matched"] for r in ranked[1:] if r["confidence"] >= 0.5]
+        if alternatives:
+            st.markdown("---")
+            st.markdown("**Did you mean…**")
+            alt_cols = st.columns(len(alternatives))
+            for i, alt in enumerate(alternatives):
+                with alt_cols[i]:
+                    if st.button(alt.replace("_", " ").title(), key=f"alt_{i}", use_container_width=True):
+                        st.session_state.search_query = alt
+                        st.rerun()
+        
+        # Neighbours of the matched answer, minus the ones already offered above
+        suggestions = [key for key in get_related(kb_result["matched"], k=6) if key not in alternatives][:3]
         if suggestions:
             st.markdown("---")
             st.markdown("**Related questions:**")
@@ -774,7 +865,13 @@ elif page == "results":
     else:
         # Fall back to Wikipedia
         with st.spinner(f"Searching for '{query}'..."):
-            wiki = search_gambia_wikipedia(query)
+            wiki = search_gambia_wikipedia(corrected)
+        
+        if log_search:
+            best = kb_result or {}
+            found = None if wiki.get("unavailable") else bool(wiki.get("success"))  # None: Wikipedia didn't answer
+            QUERY_LOG.record(corrected, best.get("tier"), best.get("confidence", 0), match_ms,
+                             wikipedia=True, found=found, matched=best.get("matched"))
         
         if wiki.get("success"):
             st.markdown(f"## {wiki['title']}")
@@ -788,11 +885,30 @@ elif page == "results":
                 st.markdown(wiki.get("summary", ""))
             
             st.markdown(f"\n\n*Source: [Wikipedia]({wiki.get('url', '')})*")
+        elif wiki.get("unavailable"):
+            st.info(f"⏳ Wikipedia isn't answering right now, so the article on **{wiki['title']}** couldn't be loaded - "
+                    f"try again in a minute, or [read it on Wikipedia]({wiki['url']}).")
         else:
             st.warning(f"I couldn't find specific information about '{query}'.")
             st.markdown("**Try asking about:**")
             st.markdown("- Visa requirements, safety, best time to visit")
             st.markdown("- Beaches, hotels, things to do")
+    
+    # Hidden debug panel - which tiers ran, how long each took, what they found
+    if traces:
+        trace = traces[-1]
+        with st.expander("🔧 Match trace"):
+            winner = trace.winner
+            st.caption(f"'{trace.normalized}' → '{trace.corrected}' · {trace.total_ms:.3f} ms · "
+                       + (f"won by **{winner['key']}** ({winner['tier']}, {winner['confidence']:.2f})" if winner else "no match"))
+            st.table([
+                {"stage": s["stage"], "ms": f"{s['ms']:.4f}",
+                 "found": ", ".join(f"{c['key']} ({c['confidence']:.2f})" for c in s["candidates"])}
+                for s in trace.stages
+            ])
+            if trace.stopped_after:
+                st.caption(f"Stopped after the {trace.stopped_after} stage - enough candidates already")
+            st.json(trace.to_dict(), expanded=False)
 
 # ============== TRAVEL GUIDES PAGE ==============
 elif page == "guides":
@@ -805,8 +921,9 @@ elif page == "guides":
     
     for i, tab in enumerate(tabs):
         with tab:
-            if KB_LOADED and keys[i] in QUICK_ANSWERS:
-                st.markdown(QUICK_ANSWERS[keys[i]])
+            guide = get_answer(keys[i]) if KB_LOADED else None
+            if guide:
+                show_answer(keys[i], guide)
             else:
                 st.info("Guide coming soon!")
 
@@ -918,7 +1035,7 @@ elif page == "attractions":
     st.markdown("---")
     
     for a in ATTRACTIONS:
-        with st.expander(f"**{a['name']}** - {a['type']}"):
+        with st.expander(f"**{a['name']}** - {a['type']}", expanded=a['name'] == st.session_state.get("catalog_item")):
             st.markdown(f"**📝 Description:** {a['desc']}")
             st.markdown(f"**💵 Cost:** {a['cost']}")
             
@@ -1084,6 +1201,10 @@ elif page == "currency":
     
     st.markdown("---")
     st.markdown("### Current Rates (approximate)")
+    if rates.get("success"):
+        st.caption(f"Updated {format_age(rates['age'])}")
+    else:
+        st.caption("Live rates unavailable - showing typical rates")
     
     rate_cols = st.columns(3)
     with rate_cols[0]:
@@ -1758,39 +1879,28 @@ elif page == "weather":
     with wcols[3]:
         st.metric("Conditions", icon)
     
+    if w.get("success"):
+        st.caption(f"Updated {format_age(w['age'])}")
+    else:
+        st.caption("Live weather unavailable - showing typical conditions")
+    
     st.markdown("---")
     st.markdown("### 📅 7-Day Forecast")
     
-    # Fetch 7-day forecast
-    try:
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {
-            "latitude": 13.4549, "longitude": -16.5790,
-            "daily": "temperature_2m_max,temperature_2m_min,precipitation_probability_max,weather_code",
-            "timezone": "GMT", "forecast_days": 7
-        }
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 200:
-            data = r.json().get("daily", {})
-            dates = data.get("time", [])
-            max_temps = data.get("temperature_2m_max", [])
-            min_temps = data.get("temperature_2m_min", [])
-            rain_probs = data.get("precipitation_probability_max", [])
-            codes = data.get("weather_code", [])
-            
-            fcols = st.columns(7)
-            for i, col in enumerate(fcols):
-                if i < len(dates):
-                    day_name = datetime.strptime(dates[i], "%Y-%m-%d").strftime("%a")
-                    with col:
-                        st.markdown(f"**{day_name}**")
-                        st.markdown(f"{get_weather_icon(codes[i] if i < len(codes) else 0)}")
-                        st.markdown(f"🔺 {max_temps[i]:.0f}°")
-                        st.markdown(f"🔻 {min_temps[i]:.0f}°")
-                        st.markdown(f"💧 {rain_probs[i]:.0f}%")
-        else:
-            st.warning("Could not load forecast data")
-    except:
+    # 7-day forecast - fetched together with the current weather above
+    if w.get("daily"):
+        fcols = st.columns(7)
+        for col, day in zip(fcols, w["daily"]):
+            day_name = datetime.strptime(day["date"], "%Y-%m-%d").strftime("%a")
+            with col:
+                st.markdown(f"**{day_name}**")
+                st.markdown(f"{get_weather_icon(day['code'])}")
+                st.markdown(f"🔺 {day['max']:.0f}°")
+                st.markdown(f"🔻 {day['min']:.0f}°")
+                st.markdown(f"💧 {day['rain']:.0f}%")
+    elif w.get("success"):
+        st.warning("Could not load forecast data")
+    else:
         st.warning("Weather forecast temporarily unavailable")
     
     st.markdown("---")
@@ -0,0 +1,81 @@
+"""
+⚡ ANSWER STORE BENCHMARK
+Startup time and resident memory of answers as a Python dict literal
+(how knowledge_base.py used to ship them) vs the compiled, mmap-backed
+AnswerStore, at 1x, 10x and 100x the current number of answers
+
+Run: python benchmarks/bench_answer_store.py
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from answer_store import AnswerStore, build_store  # noqa: E402
+from knowledge_base import QUICK_ANSWERS  # noqa: E402
+
+# Runs in a fresh interpreter: prints import seconds and RSS growth in KiB
+CHILD = """
+import sys, time
+sys.path.insert(0, {root!r}); sys.path.insert(0, {tmp!r})
+def rss():
+    for line in open("/proc/self/status"):
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+import answer_store  # module import cost is not what we measure
+before = rss()
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+print(elapsed, rss() - before)
+"""
+
+
+def scaled_answers(factor: int) -> dict:
+    return {f"{key} {i}" if i else key: body for i in range(factor) for key, body in QUICK_ANSWERS.items()}
+
+
+def run_child(tmp: Path, load: str) -> tuple:
+    code = CHILD.format(root=str(ROOT), tmp=str(tmp), load=load)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    seconds, kib = out.split()
+    return float(seconds) * 1000, int(kib) / 1024
+
+
+def main():
+    print(f"{'answers':>8} | {'dict import ms':>14} | {'dict RSS MB':>11} | {'store open ms':>13} | {'store RSS MB':>12} | {'get µs (cold/hot)':>18}")
+    print("-" * 92)
+    for factor in (1, 10, 100):
+        answers = scaled_answers(factor)
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "kb_literal.py").write_text(f"QUICK_ANSWERS = {json.dumps(answers, ensure_ascii=False)}\n", encoding="utf-8")
+            build_store(tmp / "answers.store", answers, {})
+
+            run_child(tmp, "import kb_literal")  # first run writes the .pyc
+            dict_ms, dict_mb = run_child(tmp, "import kb_literal")
+            store_ms, store_mb = run_child(tmp, f"s = answer_store.AnswerStore({str(tmp / 'answers.store')!r})")
+
+            store = AnswerStore(tmp / "answers.store")
+            keys = list(store)[:200]
+            start = time.perf_counter()
+            for key in keys:
+                store[key]
+            cold = (time.perf_counter() - start) / len(keys) * 1e6
+            start = time.perf_counter()
+            for key in keys[-50:]:
+                store[key]
+            hot = (time.perf_counter() - start) / 50 * 1e6
+
+        print(f"{len(answers):>8} | {dict_ms:>14.1f} | {dict_mb:>11.1f} | {store_ms:>13.1f} | {store_mb:>12.1f} | {cold:>8.1f} / {hot:<7.1f}")
+    print("\n(dict import times are with a warm .pyc, as on a restarted worker)")
+
+
+if __name__ == "__main__":
+    main()
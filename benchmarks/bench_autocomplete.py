@@ -0,0 +1,64 @@
+"""
+⚡ AUTOCOMPLETE BENCHMARK
+Per-keystroke cost of the prefix trie against a scan over every phrase,
+at 1x, 10x and 100x the current number of keywords and answer keys
+
+Run: python benchmarks/bench_autocomplete.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from knowledge_base import KEYWORD_MAP, QUICK_ANSWERS  # noqa: E402
+from search_index import PrefixTrie  # noqa: E402
+from tokenizer import tokenize  # noqa: E402
+
+TYPED = ["kunta kinteh island", "best time to visit", "makasutu", "where to stay", "senegal border"]
+
+
+def scaled_phrases(factor: int) -> list:
+    """Keywords and answer keys repeated under new names, as (text, value, priority) triples."""
+    phrases = list(dict.fromkeys([*KEYWORD_MAP, *QUICK_ANSWERS]))
+    return [(f"{p} {i}" if i else p, p, 1) for i in range(factor) for p in phrases]
+
+
+def scan(phrases, prefix, k=5):
+    """What a trie-less autocomplete does: test every phrase and word start, then sort."""
+    prefix = tokenize(prefix).normalized
+    found = []
+    for order, (text, value, priority) in enumerate(phrases):
+        words = tokenize(text).words
+        for start in range(len(words)):
+            if " ".join(words[start:]).startswith(prefix):
+                found.append(((start > 0, priority, len(text), order), value))
+                break
+    return [value for _, value in sorted(found)[:k]]
+
+
+def per_keystroke_us(fn, rounds: int) -> float:
+    keystrokes = [text[:i] for text in TYPED for i in range(1, len(text) + 1)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for prefix in keystrokes:
+            fn(prefix)
+    return (time.perf_counter() - start) / (rounds * len(keystrokes)) * 1e6
+
+
+def main():
+    print(f"{'phrases':>8} | {'build ms':>9} | {'scan µs/key':>12} | {'trie µs/key':>12}")
+    print("-" * 51)
+    for factor in (1, 10, 100):
+        phrases = scaled_phrases(factor)
+        start = time.perf_counter()
+        trie = PrefixTrie(phrases)
+        build_ms = (time.perf_counter() - start) * 1000
+        scan_us = per_keystroke_us(lambda p: scan(phrases, p), max(20 // factor, 1))
+        trie_us = per_keystroke_us(lambda p: trie.complete(p, 5), 200)
+        print(f"{len(phrases):>8} | {build_ms:>9.1f} | {scan_us:>12.1f} | {trie_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
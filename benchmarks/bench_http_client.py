@@ -0,0 +1,128 @@
+"""
+⚡ HTTP CLIENT BENCHMARK
+requests.get per call (a new connection every time) vs the pooled http_client session,
+against a local stub server that counts connections and charges a handshake delay on
+each new one - standing in for the TCP + TLS setup a real upstream costs
+Also checks that retries recover from a flaky upstream and stop at the retry budget
+
+Run: python benchmarks/bench_http_client.py [--requests 200] [--handshake-ms 30]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+
+from http_client import HostPolicy, HttpClient, UpstreamError  # noqa: E402
+
+
+class StubServer(ThreadingHTTPServer):
+    """Answers every GET with a small JSON body; /flaky/<n> fails n times with 503 first."""
+
+    daemon_threads = True
+
+    def __init__(self, handshake_ms: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.handshake = handshake_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self.failures_left = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = 64 * 1024  # headers and body in one packet, or delayed ACKs stall every keep-alive request
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            status = 200
+            if self.path.startswith("/flaky/"):
+                left = self.server.failures_left.setdefault(self.path, int(self.path.rsplit("/", 1)[-1]))
+                if left:
+                    self.server.failures_left[self.path] = left - 1
+                    status = 503
+        body = json.dumps({"current": {"temperature_2m": 28.5}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(server: StubServer, count: int, get) -> dict:
+    server.connections = server.requests = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        get(f"{server.url}/v1/forecast")
+    elapsed = time.perf_counter() - start
+    return {"ms_per_request": elapsed / count * 1000, "connections": server.connections, "requests": server.requests}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP client benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=30, help="delay charged per new connection")
+    args = parser.parse_args()
+
+    server = StubServer(args.handshake_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = server.url.split("//", 1)[1]
+    client = HttpClient(policies={host: HostPolicy(timeout=(1, 2), retries=2, backoff=0.01)})
+
+    try:
+        fresh = timed(server, args.requests, lambda url: requests.get(url, timeout=2).json())
+        pooled = timed(server, args.requests, client.get_json)
+        print(f"{args.requests} requests, {args.handshake_ms:.0f} ms per new connection")
+        print(f"  {'':<14} | {'ms/request':>10} | {'connections':>11}")
+        for name, result in (("requests.get", fresh), ("http_client", pooled)):
+            print(f"  {name:<14} | {result['ms_per_request']:>10.2f} | {result['connections']:>11}")
+        print(f"  saved {fresh['ms_per_request'] - pooled['ms_per_request']:.2f} ms per request")
+
+        server.requests = 0
+        client.get_json(f"{server.url}/flaky/2")  # two 503s, then a 200 on the last allowed attempt
+        recovered = server.requests
+        server.requests = 0
+        try:
+            client.get_json(f"{server.url}/flaky/5")
+            exhausted = None
+        except UpstreamError as e:
+            exhausted = e
+        print(f"\nflaky upstream: recovered after {recovered} attempts; "
+              f"gave up after {server.requests} with {exhausted}")
+        print(json.dumps(client.stats()["upstreams"], indent=1))
+    finally:
+        client.close()
+        server.shutdown()
+
+    if pooled["connections"] != 1:
+        sys.exit(f"Expected one pooled connection, saw {pooled['connections']}")
+    if recovered != 3 or exhausted is None or server.requests != 3:
+        sys.exit("Retries did not stop at the retry budget")
+    print("OK - one connection reused for every request, retries bounded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+⚡ KEYWORD MATCHING BENCHMARK
+Old sorted-scan matcher vs the prebuilt KeywordAutomaton,
+at 1x, 10x and 100x the current KEYWORD_MAP size
+
+Run: python benchmarks/bench_keywords.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from knowledge_base import KEYWORD_MAP  # noqa: E402
+from search_index import KeywordAutomaton  # noqa: E402
+
+QUERIES = [
+    "do i need a visa", "is it safe for a solo female traveller", "best beach near kololi",
+    "how far is basse from banjul", "where can i change money", "what should i pack",
+    "tell me about the history of gambia", "cheap hotel near the airport",
+    "something with no keyword at all", "kachikally crocodile pool opening hours",
+]
+
+
+def synthetic_keywords(count: int, seed: int = 42) -> list:
+    """The real keywords plus made-up phrases of a similar length."""
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_MAP)
+    lengths = [len(k) for k in keywords]
+    while len(keywords) < count:
+        size = rng.choice(lengths)
+        word = "".join(rng.choice(string.ascii_lowercase + "  ") for _ in range(size)).strip()
+        if word:
+            keywords.append(word)
+    return keywords
+
+
+def legacy_match(keywords, query):
+    """What get_smart_answer used to do on every call."""
+    for keyword in sorted(keywords, key=len, reverse=True):
+        if keyword in query:
+            return keyword
+    return None
+
+
+def time_per_query(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in QUERIES:
+            fn(q)
+    return (time.perf_counter() - start) / (rounds * len(QUERIES)) * 1e6
+
+
+def main():
+    base = len(KEYWORD_MAP)
+    print(f"{'keywords':>9} | {'build ms':>9} | {'legacy µs/q':>12} | {'automaton µs/q':>15} | speedup")
+    print("-" * 66)
+    for factor in (1, 10, 100):
+        keywords = synthetic_keywords(base * factor)
+        start = time.perf_counter()
+        automaton = KeywordAutomaton(keywords)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for q in QUERIES:
+            assert automaton.longest(q) == legacy_match(keywords, q), q
+
+        rounds = max(2000 // factor, 20)
+        legacy = time_per_query(lambda q: legacy_match(keywords, q), rounds)
+        fast = time_per_query(automaton.longest, rounds)
+        print(f"{len(keywords):>9} | {build_ms:>9.1f} | {legacy:>12.1f} | {fast:>15.1f} | {legacy / fast:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+⚡ MATCHER BENCHMARK SUITE
+get_smart_answer and get_suggestions on a realistic query mix, against the real
+knowledge base and synthetic ones 10x, 100x and 1000x its size
+Reports p50/p95/p99 per matching tier, queries per second and build time,
+and saves the results as JSON so two commits can be compared
+
+Run: python benchmarks/bench_matcher.py [--scales 1,10,100,1000] [--queries 1000]
+     python benchmarks/bench_matcher.py --compare benchmarks/results/<older>.json
+"""
+
+import argparse
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import knowledge_base as kb  # noqa: E402
+from tokenizer import tokenize  # noqa: E402
+
+RESULTS_PATH = ROOT / "benchmarks" / "results"
+CATEGORIES = ("exact_keyword", "exact_key", "substring", "long", "typo", "miss")
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+# =============================================================================
+# SYNTHETIC KNOWLEDGE BASES
+# =============================================================================
+
+
+def copy_suffix(i: int) -> str:
+    """A made-up letter suffix per copy (1 -> "b", 26 -> "ba"), so new words stay alphabetic."""
+    letters = ""
+    while True:
+        i, r = divmod(i, 26)
+        letters = "abcdefghijklmnopqrstuvwxyz"[r] + letters
+        if not i:
+            return letters
+
+
+def synthetic_kb(answers: dict, keywords: dict, factor: int) -> tuple:
+    """The real knowledge base plus factor - 1 altered copies of it.
+
+    Copy i files every answer and keyword under "<key> <i>", and renames the
+    rare words of each body (the place names, dishes, people...) by giving
+    them a per-copy suffix. Common words stay shared, so the vocabulary grows
+    the way a real, bigger knowledge base would.
+    """
+    df = Counter(word for body in answers.values() for word in set(tokenize(body).words))
+    rare = {word for word, count in df.items() if count <= 2 and len(word) > 3 and word.isalpha()}
+
+    big_answers, big_keywords = dict(answers), dict(keywords)
+    for i in range(1, factor):
+        suffix = copy_suffix(i)
+        rename = lambda m: m.group(0) + suffix if m.group(0).lower() in rare else m.group(0)  # noqa: E731
+        for key, body in answers.items():
+            big_answers[f"{key} {i}"] = _WORD_RE.sub(rename, body)
+        for keyword, key in keywords.items():
+            big_keywords[f"{keyword} {i}"] = f"{key} {i}"
+    return big_answers, big_keywords
+
+
+# =============================================================================
+# QUERY MIX
+# =============================================================================
+
+
+def query_mix(answers: dict, keywords: dict, count: int, seed: int = 7) -> list:
+    """(category, query) pairs in equal parts from every category."""
+    rng = random.Random(seed)
+    keyword_list, key_list = list(keywords), list(answers)
+    bodies = [answers[key] for key in rng.sample(key_list, min(len(key_list), 200))]
+
+    def typo(word):
+        i = rng.randrange(len(word))
+        return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + rng.choice("aeiou") + word[i:]
+
+    makers = {
+        "exact_keyword": lambda: rng.choice(keyword_list),
+        "exact_key": lambda: rng.choice(key_list),
+        "substring": lambda: f"{rng.choice(['tell me about', 'any tips on', 'what about'])} {rng.choice(keyword_list)} please",
+        "long": lambda: " ".join(rng.sample(tokenize(rng.choice(bodies)).words, 25)),
+        "typo": lambda: " ".join(typo(w) if len(w) >= 5 else w for w in rng.choice(keyword_list).split()),
+        "miss": lambda: " ".join("".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(6)) for _ in range(3)),
+    }
+    queries = []
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        while True:
+            try:
+                queries.append((category, makers[category]()))
+                break
+            except ValueError:  # a body too short to sample 25 words from
+                continue
+    rng.shuffle(queries)
+    return queries
+
+
+# =============================================================================
+# MEASUREMENTS
+# =============================================================================
+
+
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)] * 1000
+
+    return {"count": len(ordered), "p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99)}
+
+
+def import_ms() -> float:
+    """Time to import knowledge_base in a fresh interpreter (loads the store, builds every index)."""
+    code = "import time; t = time.perf_counter(); import knowledge_base; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def run_scale(factor: int, answers: dict, keywords: dict, count: int) -> dict:
+    big_answers, big_keywords = synthetic_kb(answers, keywords, factor) if factor > 1 else (answers, keywords)
+    kb.QUICK_ANSWERS, kb.KEYWORD_MAP = big_answers, big_keywords
+    start = time.perf_counter()
+    kb.get_indexes()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = query_mix(big_answers, big_keywords, count)
+    by_tier, by_category, suggestion_times = {}, {}, []
+    start = time.perf_counter()
+    for category, query in queries:
+        kb.ANSWER_CACHE.clear()  # measure the matcher, not the cache
+        t = time.perf_counter()
+        result = kb.get_smart_answer(query)
+        elapsed = time.perf_counter() - t
+        by_tier.setdefault(result["tier"] or "miss", []).append(elapsed)
+        by_category.setdefault(category, []).append(elapsed)
+    qps = len(queries) / (time.perf_counter() - start)
+
+    for _, query in queries[:200]:
+        kb.ANSWER_CACHE.clear()
+        t = time.perf_counter()
+        kb.get_suggestions(query)
+        suggestion_times.append(time.perf_counter() - t)
+
+    # The same queries again, now answered from ANSWER_CACHE
+    for _, query in queries:
+        kb.get_smart_answer(query)
+    start = time.perf_counter()
+    for _, query in queries:
+        kb.get_smart_answer(query)
+    cached_qps = len(queries) / (time.perf_counter() - start)
+
+    return {
+        "factor": factor, "answers": len(big_answers), "keywords": len(big_keywords),
+        "build_ms": build_ms, "qps": qps, "cached_qps": cached_qps,
+        "tiers": {tier: percentiles(times) for tier, times in by_tier.items()},
+        "categories": {category: percentiles(times) for category, times in by_category.items()},
+        "suggestions": percentiles(suggestion_times),
+    }
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def print_scale(result: dict, baseline: dict = None):
+    print(f"\n{result['answers']} answers / {result['keywords']} keywords ({result['factor']}x): "
+          f"build {result['build_ms']:.0f} ms, {result['qps']:.0f} queries/s uncached, "
+          f"{result['cached_qps']:.0f} cached")
+    print(f"  {'tier':<14} | {'count':>5} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}" + (" | p95 vs base" if baseline else ""))
+    rows = [(tier, stats) for tier, stats in result["tiers"].items()]
+    rows.sort(key=lambda row: kb.MATCH_TIERS.index(row[0]) if row[0] in kb.MATCH_TIERS else len(kb.MATCH_TIERS))
+    rows.append(("suggestions", result["suggestions"]))
+    for name, stats in rows:
+        line = f"  {name:<14} | {stats['count']:>5} | {stats['p50_ms']:>8.3f} | {stats['p95_ms']:>8.3f} | {stats['p99_ms']:>8.3f}"
+        if baseline:
+            base = baseline["tiers"].get(name) if name != "suggestions" else baseline.get("suggestions")
+            if base and base["p95_ms"]:
+                line += f" | {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matcher benchmark suite")
+    parser.add_argument("--scales", default="1,10,100,1000", help="knowledge base sizes, as multiples of the real one")
+    parser.add_argument("--queries", type=int, default=1200, help="queries per scale")
+    parser.add_argument("--out", help="where to save the JSON results (default: benchmarks/results/matcher-<commit>.json)")
+    parser.add_argument("--compare", help="earlier JSON results to compare p95 latencies against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        baseline = {scale["factor"]: scale for scale in json.loads(Path(args.compare).read_text())["scales"]}
+
+    results = {"revision": git_revision(), "python": sys.version.split()[0], "numpy": kb.HAVE_NUMPY,
+               "import_ms": import_ms(), "scales": []}
+    print(f"import knowledge_base: {results['import_ms']:.0f} ms (revision {results['revision']})")
+
+    answers, keywords = dict(kb.QUICK_ANSWERS.items()), dict(kb.KEYWORD_MAP)
+    for factor in (int(s) for s in args.scales.split(",")):
+        result = run_scale(factor, answers, keywords, args.queries)
+        results["scales"].append(result)
+        print_scale(result, baseline.get(factor))
+
+    out = Path(args.out) if args.out else RESULTS_PATH / f"matcher-{results['revision']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+⚡ PAGE BENCHMARK (OFFLINE)
+The weather, currency and results pages rendered against the local stub upstream
+(tools/stub_upstream.py) while it is healthy, slow, failing and timing out - no network needed
+For each scenario: how long a background refresh of weather + rates takes and how many of the
+two succeeded, page render p50 per page, and how many upstream requests the page renders
+themselves caused (should be 0)
+
+Run: python benchmarks/bench_pages.py [--runs 5] [--timeout-s 1]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from stub_upstream import StubUpstream  # noqa: E402
+
+PAGES = {"weather": None, "currency": None, "results": "zebra banjul"}  # page -> search query
+SCENARIOS = [
+    ("healthy", {"latency_ms": 30}),
+    ("slow (2 s)", {"latency_ms": 2000}),
+    ("outage (503)", {"error_rate": 1.0}),
+    ("timeouts", {"timeout_rate": 1.0}),
+    ("weather down", {"open-meteo": {"error_rate": 1.0}}),  # rates must still refresh
+]
+NO_FAULTS = {"latency_ms": 0.0, "jitter_ms": 0.0, "error_rate": 0.0, "timeout_rate": 0.0}
+
+
+def render(page: str, query: str = None) -> float:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    at.session_state.page = page
+    if query:
+        at.session_state.search_query = query
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"{page} page failed: {at.exception[0].message}")
+    return elapsed
+
+
+def stub_requests(server: StubUpstream) -> int:
+    with server.lock:
+        return sum(s["requests"] for s in server.stats.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline page benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="renders per page and scenario")
+    parser.add_argument("--timeout-s", type=float, default=1.0, help="client read timeout while benchmarking")
+    args = parser.parse_args()
+
+    server = StubUpstream(port=0, seed=7)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scratch = tempfile.mkdtemp(prefix="tgta-bench-")
+    os.environ.update({
+        "TGTA_UPSTREAM_URL": server.url, "TGTA_API_CACHE": "", "TGTA_QUERY_LOG": "",
+        "TGTA_WIKI_SNAPSHOT": str(Path(scratch) / "wikipedia.json"),
+    })
+
+    # Imported only now, so they pick up the stub's URL
+    import http_client
+    import live_data
+    import wiki
+
+    server.configure({"hang_s": args.timeout_s * 3})  # a timeout outlasts the client's read timeout
+
+    def fresh_client():
+        policy = http_client.HostPolicy(timeout=(args.timeout_s, args.timeout_s), retries=1, backoff=0.05)
+        http_client.CLIENT = http_client.HttpClient(policies={api: policy for api in http_client.BASE_URLS})
+
+    fresh_client()
+    wiki.refresh_snapshot()  # the snapshot a deploy would ship
+    live_data.refresh_due()
+    live_data.start_refresher(interval=3600)  # started here so the app's own start is a no-op
+    wiki.start_snapshot_refresher(interval=3600)
+    render("home")  # warm up Streamlit and the knowledge base
+
+    print(f"Stub upstream at {server.url}; {args.runs} renders per page, client timeout {args.timeout_s:.1f} s\n")
+    header = f"  {'scenario':<14} | {'refresh ms':>10} | {'refreshed':>9} | " + " | ".join(f"{p + ' p50':>12}" for p in PAGES) + " | page requests"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for name, faults in SCENARIOS:
+        server.configure(dict(NO_FAULTS, **faults))
+        fresh_client()
+        for dataset in live_data.DATASETS:  # make both due, as if their TTL had run out
+            dataset.fetched_at = dataset.fetched_at and dataset.fetched_at - dataset.ttl
+            dataset.last_attempt = dataset.error = None
+        start = time.perf_counter()
+        refreshed = live_data.refresh_due()
+        refresh_ms = (time.perf_counter() - start) * 1000
+
+        before = stub_requests(server)
+        p50s = [statistics.median(render(page, query) for _ in range(args.runs)) for page, query in PAGES.items()]
+        page_requests = stub_requests(server) - before
+        print(f"  {name:<14} | {refresh_ms:>10.0f} | {refreshed:>7}/{len(live_data.DATASETS)} | " + " | ".join(f"{ms:>12.0f}" for ms in p50s) + f" | {page_requests:>13}")
+
+    server.shutdown()
+    print("\nPages read the last good values and the Wikipedia snapshot, so upstream faults only slow the background refresh")
+
+
+if __name__ == "__main__":
+    main()
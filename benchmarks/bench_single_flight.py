@@ -0,0 +1,124 @@
+"""
+⚡ SINGLE-FLIGHT CHECK
+100 sessions missing the same cold value at the same moment: how many upstream calls they make
+- plain requests.get per session, against a slow local stub server
+- http_client.get_json for one URL (coalesced)
+- a cold LiveDataset refreshed by every session (weather / exchange rates)
+- a Wikipedia search for an article missing from the snapshot
+Exits with an error unless each coalesced case makes exactly one call
+
+Run: python benchmarks/bench_single_flight.py [--sessions 100] [--delay-ms 200]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+
+import http_client  # noqa: E402
+import wiki  # noqa: E402
+from bench_http_client import StubServer  # noqa: E402
+from live_data import LiveDataset  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+def stampede(sessions: int, fn) -> float:
+    """Run fn in that many threads released at the same instant; returns the wall time in ms."""
+    barrier = threading.Barrier(sessions)
+    errors = []
+
+    def run():
+        barrier.wait()
+        try:
+            fn()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return (time.perf_counter() - start) * 1000
+
+
+class SlowCounter:
+    """An upstream that takes delay seconds per call and counts its calls."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"title": "Banjul", "extract": "The capital of The Gambia", "temperature": 30}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-flight check")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--delay-ms", type=float, default=200, help="how long each upstream call takes")
+    args = parser.parse_args()
+    delay = args.delay_ms / 1000
+
+    server = StubServer(handshake_ms=args.delay_ms)  # every new connection is slow, so requests overlap
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"{server.url}/v1/forecast"
+    host = server.url.split("//", 1)[1]
+    client = http_client.HttpClient(policies={host: http_client.HostPolicy(timeout=(5, 5), pool_size=args.sessions)})
+    rows = []
+
+    try:
+        server.requests = 0
+        ms = stampede(args.sessions, lambda: requests.get(url, timeout=10).json())
+        rows.append(("requests.get (before)", server.requests, ms, False))
+
+        server.requests = 0
+        ms = stampede(args.sessions, lambda: client.get_json(url))
+        rows.append(("http_client.get_json", server.requests, ms, True))
+    finally:
+        client.close()
+        server.shutdown()
+
+    upstream = SlowCounter(delay)
+    dataset = LiveDataset("Weather", "bench:weather", upstream, {}, ttl=1800)
+    ms = stampede(args.sessions, dataset.refresh)
+    rows.append(("LiveDataset.refresh", upstream.calls, ms, True))
+
+    upstream = SlowCounter(delay)
+    real_client, real_cache = http_client.CLIENT, wiki.API_CACHE
+    http_client.CLIENT = http_client.HttpClient()
+    http_client.CLIENT.get_json = upstream
+    wiki.API_CACHE = ResponseCache(None)
+    wiki.SNAPSHOT.pop("Banjul", None)
+    wiki.MISS_CACHE.clear()
+    try:
+        ms = stampede(args.sessions, lambda: wiki.search_gambia_wikipedia("banjul"))
+        rows.append(("Wikipedia search", upstream.calls, ms, True))
+    finally:
+        http_client.CLIENT, wiki.API_CACHE = real_client, real_cache
+
+    print(f"{args.sessions} simultaneous sessions, {args.delay_ms:.0f} ms per upstream call\n")
+    print(f"  {'':<24} | {'upstream calls':>14} | {'wall ms':>8}")
+    for name, calls, ms, _ in rows:
+        print(f"  {name:<24} | {calls:>14} | {ms:>8.0f}")
+
+    failed = [name for name, calls, _, coalesced in rows if coalesced and calls != 1]
+    if failed:
+        sys.exit(f"More than one upstream call for: {failed}")
+    print("\nOK - exactly one upstream call per coalesced case")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+⚡ SPELLING CORRECTION BENCHMARK
+Corrects a corpus of misspelled tourist queries and reports accuracy,
+per-query latency and how many more queries get a local answer, plus how
+often ordinary English the knowledge base doesn't use gets "corrected" anyway
+
+Run: python benchmarks/bench_spelling.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import knowledge_base as kb  # noqa: E402
+from search_index import SpellingIndex  # noqa: E402
+from tokenizer import tokenize  # noqa: E402
+
+TEMPLATES = ["{}", "how do i get to {}", "is {} worth visiting", "hotels near {}", "tell me about {}"]
+
+# Real misspellings seen in the wild
+KNOWN_TYPOS = {
+    "janjanbure": "janjanbureh", "kachikaly": "kachikally", "makasuto": "makasutu",
+    "serekunder": "serekunda", "banjull": "banjul", "kololli": "kololi",
+    "abucko": "abuko", "bijillo": "bijilo", "farafeni": "farafenni", "mandinca": "mandinka",
+}
+
+# Correctly spelled questions in words no answer uses - none of them should change
+ORDINARY_QUERIES = [
+    "post office", "this is a test", "pharmacy near me", "dentist", "laundry service", "passport photo",
+    "train station", "parking", "wifi password", "printer", "haircut", "yoga class", "church service",
+    "mosque prayer times", "gym", "bakery", "supermarket", "bookshop", "car rental", "tennis court", "golf course",
+    "police station", "embassy address", "cinema", "petrol station", "hospital", "doctor", "can i bring my dog",
+    "rain jacket", "sunscreen", "mosquito net", "snorkel", "kayak", "cooking class", "bike hire", "send mail",
+    "lost wallet", "help", "vegan options", "late checkout", "hair salon", "horse riding", "camera", "charger",
+    "adapter plug", "toilet", "shower", "towel", "music festival", "night market", "cash machine", "bank hours",
+    "phone repair", "jazz bar", "coffee shop", "bread", "fruit", "cheap flights",
+]
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """One random delete, insert, substitution or transposition."""
+    i = rng.randrange(len(word))
+    op = rng.choice("disT")
+    if op == "d":
+        return word[:i] + word[i + 1:]
+    if op == "i":
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+    if op == "s":
+        return word[:i] + rng.choice(string.ascii_lowercase.replace(word[i], "")) + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def corpus(size: int = 2000, seed: int = 7) -> list:
+    """(misspelled query, intended word) pairs."""
+    rng = random.Random(seed)
+    speller = kb.get_indexes().speller
+    targets = sorted(speller.counts)
+    pairs = [(rng.choice(TEMPLATES).format(bad), good) for bad, good in KNOWN_TYPOS.items()]
+    while len(pairs) < size:
+        good = rng.choice(targets)
+        bad = typo(good, rng)
+        if bad != good and bad not in speller.known:
+            pairs.append((rng.choice(TEMPLATES).format(bad), good))
+    return pairs
+
+
+def main():
+    pairs = corpus()
+    indexes = kb.get_indexes()
+
+    start = time.perf_counter()
+    SpellingIndex(indexes.speller.counts.elements(), indexes.bm25.postings)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    speller = indexes.speller
+    speller._memo.clear()
+    start = time.perf_counter()
+    corrected = [speller.correct(q) for q, _ in pairs]
+    cold_us = (time.perf_counter() - start) / len(pairs) * 1e6
+
+    start = time.perf_counter()
+    for q, _ in pairs:
+        speller.correct(q)
+    warm_us = (time.perf_counter() - start) / len(pairs) * 1e6
+
+    fixed = sum(good in fixed_q.split() for (_, good), fixed_q in zip(pairs, corrected))
+    answered_before = sum(bool(kb._rank_uncached(indexes, tokenize(q), 1)) for q, _ in pairs)
+    answered_after = sum(bool(kb._rank_uncached(indexes, tokenize(q), 1)) for q in corrected)
+
+    print(f"queries:              {len(pairs)}")
+    print(f"vocabulary:           {len(speller.counts)} words, index built in {build_ms:.1f} ms")
+    print(f"corrected to target:  {fixed / len(pairs):.1%}")
+    print(f"latency (cold):       {cold_us:.1f} µs/query")
+    print(f"latency (memoized):   {warm_us:.1f} µs/query")
+    print(f"answered locally:     {answered_before / len(pairs):.1%} -> {answered_after / len(pairs):.1%}")
+
+    changed = [(q, speller.correct(q)) for q in ORDINARY_QUERIES if speller.correct(q) != tokenize(q).normalized]
+    used = [(q, kb.correct_query(q)) for q in ORDINARY_QUERIES if kb.correct_query(q) != tokenize(q).normalized]
+    print(f"false corrections:    {len(changed)} of {len(ORDINARY_QUERIES)} ordinary queries "
+          f"({len(used)} used by rank_answers)")
+    for query, corrected in changed:
+        print(f"  {query!r} -> {corrected!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+⚡ TF-IDF SCALING BENCHMARK
+Per-query cost of the NumPy TF-IDF tier against the old per-key
+word-overlap loop, at 1x, 10x and 100x the current number of answers
+
+Run: python benchmarks/bench_tfidf.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from knowledge_base import QUICK_ANSWERS  # noqa: E402
+from search_index import TfidfIndex  # noqa: E402
+from tokenizer import tokenize  # noqa: E402
+
+QUERIES = ["where can i see birds and monkeys", "nightlife near the beach", "ferry to barra",
+           "is the tap water drinkable", "mosquito net and malaria tablets"]
+
+
+def scaled_answers(factor: int) -> dict:
+    """The real answers repeated under new keys, so vocabulary and lengths stay realistic."""
+    return {f"{key} {i}" if i else key: body for i in range(factor) for key, body in QUICK_ANSWERS.items()}
+
+
+def overlap_loop(answers, query):
+    """The old last tier: a Python set intersection per answer key."""
+    query_words = set(tokenize(query).terms)
+    best, best_score = None, 0
+    for key in answers:
+        score = len(query_words & set(key.split()))
+        if score > best_score:
+            best, best_score = key, score
+    return best
+
+
+def per_query_us(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in QUERIES:
+            fn(q)
+    return (time.perf_counter() - start) / (rounds * len(QUERIES)) * 1e6
+
+
+def main():
+    print(f"{'answers':>8} | {'build ms':>9} | {'overlap loop µs/q':>18} | {'tf-idf µs/q':>12}")
+    print("-" * 57)
+    for factor in (1, 10, 100):
+        answers = scaled_answers(factor)
+        start = time.perf_counter()
+        index = TfidfIndex(answers)
+        build_ms = (time.perf_counter() - start) * 1000
+        rounds = max(400 // factor, 10)
+        loop = per_query_us(lambda q: overlap_loop(answers, q), rounds)
+        tfidf = per_query_us(lambda q: index.search(q, 5), rounds)
+        print(f"{len(answers):>8} | {build_ms:>9.1f} | {loop:>18.1f} | {tfidf:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
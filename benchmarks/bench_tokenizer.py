@@ -0,0 +1,61 @@
+"""
+⚡ TOKENIZER THROUGHPUT
+The old 19 x str.replace stopword loop vs the single-pass tokenizer
+
+Run: python benchmarks/bench_tokenizer.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tokenizer import tokenize  # noqa: E402
+
+QUERIES = [
+    "Do I need a visa?", "is it safe for a solo female traveller in this area",
+    "What are the best beaches near Kololi for families?", "how far is basse",
+    "Where can I change money and is there an ATM at the airport",
+    "tell me about the history of the gambia and kunta kinteh island", "hello",
+    "3-day itinerary from Dakar (by road)",
+]
+
+OLD_STOPWORDS = ["what", "where", "when", "how", "why", "is", "are", "do", "does", "can",
+                 "the", "a", "an", "i", "my", "in", "to", "for", "about"]
+
+
+def legacy_normalize(query):
+    """What get_smart_answer used to do: lowercase, then strip stopwords one replace at a time."""
+    query_lower = query.lower().strip()
+    query_clean = query_lower
+    for word in OLD_STOPWORDS:
+        query_clean = query_clean.replace(word + " ", " ")
+    query_clean = " ".join(query_clean.split())
+    return query_lower, query_clean.split()
+
+
+def qps(fn, seconds: float = 1.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for q in QUERIES:
+            fn(q)
+        count += len(QUERIES)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    legacy = qps(legacy_normalize)
+    single = qps(tokenize)
+    with_bigrams = qps(lambda q: tokenize(q).ngrams(2))
+    print(f"legacy replace loop:       {legacy:>12,.0f} queries/s")
+    print(f"tokenize():                {single:>12,.0f} queries/s")
+    print(f"tokenize() + bigrams:      {with_bigrams:>12,.0f} queries/s")
+    print()
+    print("legacy output for 'is it safe in this area':", legacy_normalize("is it safe in this area")[1])
+    print("tokenize terms:                              ", list(tokenize("is it safe in this area").terms))
+
+
+if __name__ == "__main__":
+    main()
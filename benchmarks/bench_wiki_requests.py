@@ -0,0 +1,122 @@
+"""
+⚡ WIKIPEDIA REQUEST COUNT CHECK
+Outbound requests per query: the old "key in query or query in key" loop, which
+tried articles one after another until one loaded, vs the longest-match resolver
+answering from the local snapshot (an article missing from it costs one short request)
+Exits with an error if a search starts more than one request, or one that retries
+
+Run: python benchmarks/bench_wiki_requests.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import http_client  # noqa: E402
+import wiki  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from knowledge_base import GAMBIA_WIKI_MAP  # noqa: E402
+
+QUERIES = [
+    "a", "ba", "the", "kunta kinteh island", "history of the gambia", "banjul", "Banjul ", "BANJUL",
+    "is serekunda market safe", "kinteh island", "wassu stone circles", "roots", "river gambia cruise",
+    "best beach", "what language do mandinka people speak", "nothing to do with anything",
+]
+
+
+class CountingStub:
+    """Stands in for requests.get and for the HTTP client (one call = one logical request, retries included).
+
+    Counts calls, and those allowed to retry, and answers with a fixed status.
+    """
+
+    def __init__(self, status: int):
+        self.status = status
+        self.calls = 0
+        self.retrying_calls = 0
+
+    def __call__(self, url, retries=None, **kwargs):
+        self.calls += 1
+        self.retrying_calls += retries != 0
+        return _Response(self.status, url.rsplit("/", 1)[-1])
+
+    def get_json(self, url, **kwargs):
+        r = self(url, **kwargs)
+        if r.status_code != 200:
+            raise http_client.UpstreamError("en.wikipedia.org", url, "status", status=r.status_code)
+        return r.json()
+
+
+class _Response:
+    def __init__(self, status_code: int, title: str):
+        self.status_code = status_code
+        self._title = title
+
+    def json(self):
+        return {"title": self._title.replace("_", " "), "extract": "...", "content_urls": {}}
+
+
+def old_lookup(query: str, get):
+    """The loop search_gambia_wikipedia used to run."""
+    q_lower = query.lower().strip()
+    for key, article in GAMBIA_WIKI_MAP.items():
+        if key in q_lower or q_lower in key:
+            r = get(f"https://en.wikipedia.org/api/rest_v1/page/summary/{article}", timeout=10)
+            if r.status_code == 200:
+                return r.json()
+    return None
+
+
+def new_lookup(query: str, get):
+    """Requests made while searching with an empty snapshot; returns how many could retry."""
+    http_client.CLIENT = get
+    wiki.SNAPSHOT.clear()
+    wiki.MISS_CACHE.clear()
+    wiki.search_gambia_wikipedia(query)
+    return get.retrying_calls
+
+
+def main():
+    real_client = http_client.CLIENT
+    wiki.API_CACHE = ResponseCache(None)  # count requests, not what earlier runs left on disk
+    snapshot = dict(wiki.SNAPSHOT)
+    failed, retrying = [], []
+    print(f"{'query':<42} | {'old ok':>6} | {'old down':>8} | {'new ok':>6} | {'new down':>8} | article")
+    print("-" * 105)
+    try:
+        for query in QUERIES:
+            counts = []
+            for lookup in (old_lookup, new_lookup):
+                for status in (200, 503):  # Wikipedia up, Wikipedia down
+                    stub = CountingStub(status)
+                    result = lookup(query, stub)
+                    if lookup is new_lookup and result:
+                        retrying.append(query)
+                    counts.append(stub.calls)
+            if max(counts[2:]) > 1:
+                failed.append(query)
+            article = wiki.resolve_article(query) or "-"
+            print(f"{query[:42]:<42} | {counts[0]:>6} | {counts[1]:>8} | {counts[2]:>6} | {counts[3]:>8} | {article}")
+
+        start = time.perf_counter()
+        for _ in range(2000):
+            for query in QUERIES:
+                wiki.resolve_article(query)
+        per_query = (time.perf_counter() - start) / (2000 * len(QUERIES)) * 1e6
+        print(f"\nresolve_article: {per_query:.1f} µs per query")
+    finally:
+        http_client.CLIENT = real_client
+        wiki.SNAPSHOT.clear()
+        wiki.SNAPSHOT.update(snapshot)
+
+    if retrying:
+        sys.exit(f"Searches waited on retries for: {sorted(set(retrying))}")
+    if failed:
+        sys.exit(f"More than one request for: {failed}")
+    print("OK - a missing article costs at most one request, without retries")
+
+
+if __name__ == "__main__":
+    main()
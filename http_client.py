@@ -0,0 +1,395 @@
+"""
+🌐 HTTP CLIENT
+Every call to Open-Meteo, Frankfurter and Wikipedia goes through here: one pooled keep-alive
+session per upstream, bounded retries with jittered backoff, per-upstream timeouts,
+and an UpstreamError that says what went wrong instead of a bare except
+Identical JSON requests made at the same time are coalesced into one, a per-upstream circuit
+breaker fails fast while an upstream is down, and latency / error metrics are kept per upstream
+An upstream is an API from BASE_URLS, by name - so APIs served from one host (the stub
+server) still fail and recover separately - or the host of any other URL
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import SingleFlight
+
+USER_AGENT = "GambiaTravelAssistant/1.0"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RECENT_ERRORS = 50  # failures kept for stats()
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class HostPolicy:
+    """How to talk to one upstream.
+
+    timeout is (connect, read) seconds per attempt; retries is how many times a
+    failed GET is tried again, sleeping a random time up to backoff * 2**n
+    (capped at max_backoff) before retry n.
+    """
+
+    def __init__(self, timeout=(3.05, 10), retries: int = 2, backoff: float = 0.25, max_backoff: float = 2.0,
+                 pool_size: int = 10, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.failure_threshold = failure_threshold  # failed calls in a row that open the circuit
+        self.reset_timeout = reset_timeout  # seconds open before one trial call is let through
+
+
+# Where each upstream API lives. TGTA_UPSTREAM_URL points all of them at one server - e.g. the
+# local stand-in from tools/stub_upstream.py - each under its own path (/open-meteo, ...), so every
+# API keeps its own breaker and metrics; the per-API variables override single ones
+_UPSTREAM_URL = os.environ.get("TGTA_UPSTREAM_URL", "").rstrip("/")
+
+
+def _base_url(api: str, variable: str, default: str) -> str:
+    return os.environ.get(variable, f"{_UPSTREAM_URL}/{api}" if _UPSTREAM_URL else default).rstrip("/")
+
+
+BASE_URLS = {
+    "open-meteo": _base_url("open-meteo", "TGTA_OPEN_METEO_URL", "https://api.open-meteo.com"),
+    "frankfurter": _base_url("frankfurter", "TGTA_FRANKFURTER_URL", "https://api.frankfurter.app"),
+    "wikipedia": _base_url("wikipedia", "TGTA_WIKIPEDIA_URL", "https://en.wikipedia.org"),
+}
+
+UPSTREAMS = {
+    "open-meteo": HostPolicy(timeout=(3.05, 8)),
+    "frankfurter": HostPolicy(timeout=(3.05, 8)),
+    "wikipedia": HostPolicy(timeout=(3.05, 10)),
+    "upload.wikimedia.org": HostPolicy(timeout=(3.05, 10), retries=1),
+}
+DEFAULT_POLICY = HostPolicy()
+
+
+def upstream_name(url: str, base_urls: dict = BASE_URLS) -> str:
+    """The API in base_urls that url belongs to (longest base URL wins), else url's host."""
+    best = None
+    for name, base in base_urls.items():
+        if (url == base or url.startswith(base + "/")) and (best is None or len(base) > len(base_urls[best])):
+            best = name
+    return best or urlsplit(url).netloc
+
+
+class UpstreamError(Exception):
+    """A request that failed for good, after its retries.
+
+    kind is "timeout", "connection", "status" (a non-2xx answer, see status),
+    "invalid" (a body that isn't the JSON we asked for) or "circuit_open"
+    (not sent at all - the upstream's circuit breaker is open).
+    """
+
+    def __init__(self, upstream: str, url: str, kind: str, status: int = None, attempts: int = 1, detail: str = ""):
+        self.upstream = upstream
+        self.url = url
+        self.kind = kind
+        self.status = status
+        self.attempts = attempts
+        self.detail = detail
+        super().__init__(f"{upstream}: {kind}" + (f" {status}" if status else "") + f" after {attempts} attempt(s)"
+                         + (f" - {detail}" if detail else ""))
+
+    def to_dict(self) -> dict:
+        return {"upstream": self.upstream, "url": self.url, "kind": self.kind, "status": self.status,
+                "attempts": self.attempts, "detail": self.detail}
+
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold failed calls in a row -> half-open after reset_timeout.
+
+    While open, calls are refused at once instead of waiting out timeouts.
+    Half-open lets a single trial call through: success closes the circuit,
+    failure opens it again for another reset_timeout.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state, self._trial = self.HALF_OPEN, False
+            if self._trial:  # half-open: one trial call at a time
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state, self._failures, self._trial = self.CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state, self._opened_at, self._trial = self.OPEN, self._clock(), False
+
+
+class LatencyHistogram:
+    """Call latencies in fixed millisecond buckets (cumulative counts, Prometheus style)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.sum_ms += ms
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q-th call (None past the last bucket or with no calls)."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, n in zip(self.buckets + (None,), self.counts):
+            seen += n
+            if seen >= q * self.count:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, n in zip(self.buckets + ("+Inf",), self.counts):
+            total += n
+            cumulative[str(bound)] = total
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": cumulative,
+                "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95)}
+
+
+class HttpClient:
+    """Pooled sessions per upstream, created on first use and shared by every Streamlit session thread.
+
+    policies, sessions, breakers and stats are keyed by upstream_name(url, base_urls).
+    """
+
+    def __init__(self, policies: dict = None, default: HostPolicy = DEFAULT_POLICY, sleep=time.sleep,
+                 jitter=random.uniform, base_urls: dict = None):
+        self.policies = UPSTREAMS if policies is None else policies
+        self.default = default
+        self.base_urls = BASE_URLS if base_urls is None else base_urls
+        self._sleep = sleep
+        self._jitter = jitter
+        self._sessions = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._errors = deque(maxlen=RECENT_ERRORS)
+        self._flights = SingleFlight()
+
+    def policy(self, upstream: str) -> HostPolicy:
+        return self.policies.get(upstream, self.default)
+
+    def session(self, upstream: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(upstream)
+            if session is None:
+                policy = self.policy(upstream)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=policy.pool_size, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                self._sessions[upstream] = session
+            return session
+
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(upstream)
+            if breaker is None:
+                policy = self.policy(upstream)
+                breaker = self._breakers[upstream] = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+            return breaker
+
+    def get(self, url: str, params: dict = None, headers: dict = None, timeout=None,
+            retries: int = None) -> requests.Response:
+        """GET url with its upstream's policy; returns a 2xx response or raises UpstreamError.
+
+        timeout and retries override the policy's for this call.
+
+        Timeouts, connection errors and retryable statuses count against the
+        upstream's circuit breaker; other 4xx answers don't - the upstream is up.
+        """
+        upstream = upstream_name(url, self.base_urls)
+        breaker = self.breaker(upstream)
+        if not breaker.allow():
+            self._count(upstream, "short_circuited")
+            raise UpstreamError(upstream, url, "circuit_open", attempts=0, detail=f"failing fast for up to {breaker.reset_timeout:.0f} s")
+        start = time.perf_counter()
+        try:
+            r = self._get(upstream, url, params, headers, timeout, retries)
+        except UpstreamError as e:
+            self._observe(upstream, start, e)
+            if e.kind != "status" or e.status in RETRY_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        self._observe(upstream, start)
+        breaker.record_success()
+        return r
+
+    def _get(self, upstream: str, url: str, params: dict, headers: dict, timeout, retries) -> requests.Response:
+        policy = self.policy(upstream)
+        session = self.session(upstream)
+        attempts = (policy.retries if retries is None else retries) + 1
+        for attempt in range(1, attempts + 1):
+            retry_after = None
+            try:
+                r = session.get(url, params=params, headers=headers, timeout=timeout or policy.timeout)
+            except requests.Timeout as e:
+                error = UpstreamError(upstream, url, "timeout", attempts=attempt, detail=str(e))
+            except requests.RequestException as e:
+                error = UpstreamError(upstream, url, "connection", attempts=attempt, detail=str(e))
+            else:
+                if r.ok:
+                    self._count(upstream, "ok", retries=attempt - 1)
+                    return r
+                error = UpstreamError(upstream, url, "status", status=r.status_code, attempts=attempt, detail=r.reason or "")
+                if r.status_code not in RETRY_STATUSES:
+                    break
+                retry_after = _retry_after(r)
+            if attempt < attempts:
+                delay = self._jitter(0, min(policy.max_backoff, policy.backoff * 2 ** (attempt - 1)))
+                self._sleep(min(policy.max_backoff, max(delay, retry_after or 0)))
+        self._count(upstream, "failed", retries=error.attempts - 1)
+        raise error
+
+    def get_json(self, url: str, params: dict = None, headers: dict = None, timeout=None, retries: int = None):
+        """get() and parse the body as JSON; a body that isn't JSON raises UpstreamError("invalid").
+
+        Callers asking for the same URL while a request for it is in flight
+        wait for that request and share its result (don't mutate it).
+        """
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+        return self._flights.do(key, self._get_json, url, params, headers, timeout, retries)
+
+    def _get_json(self, url: str, params: dict, headers: dict, timeout, retries):
+        r = self.get(url, params=params, headers=headers, timeout=timeout, retries=retries)
+        try:
+            return r.json()
+        except ValueError as e:
+            upstream = upstream_name(url, self.base_urls)
+            error = UpstreamError(upstream, url, "invalid", status=r.status_code, detail=str(e))
+            self._record_error(upstream, error)
+            raise error from e
+
+    def _upstream_stats(self, upstream: str) -> dict:
+        stats = self._stats.get(upstream)
+        if stats is None:
+            stats = self._stats[upstream] = {"ok": 0, "failed": 0, "retries": 0, "short_circuited": 0, "errors": {},
+                                         "latency": LatencyHistogram()}
+        return stats
+
+    def _count(self, upstream: str, outcome: str, retries: int = 0):
+        with self._lock:
+            stats = self._upstream_stats(upstream)
+            stats[outcome] += 1
+            stats["retries"] += retries
+
+    def _observe(self, upstream: str, start: float, error: UpstreamError = None):
+        with self._lock:
+            self._upstream_stats(upstream)["latency"].observe((time.perf_counter() - start) * 1000)
+        if error is not None:
+            self._record_error(upstream, error)
+
+    def _record_error(self, upstream: str, error: UpstreamError):
+        with self._lock:
+            errors = self._upstream_stats(upstream)["errors"]
+            errors[error.kind] = errors.get(error.kind, 0) + 1
+            self._errors.append(dict(error.to_dict(), ts=round(time.time(), 3)))
+
+    def stats(self) -> dict:
+        """Per upstream: calls, failures, retries, calls refused by the breaker, errors by kind,
+        latency histogram and breaker state; plus the most recent failures and coalesced requests."""
+        with self._lock:
+            upstreams = {upstream: dict(s, errors=dict(s["errors"]), latency=s["latency"].to_dict()) for upstream, s in self._stats.items()}
+            breakers = dict(self._breakers)
+        for upstream, breaker in breakers.items():
+            upstreams.setdefault(upstream, {})["breaker"] = {"state": breaker.state, "opened": breaker.opened}
+        return {"upstreams": upstreams, "recent_errors": list(self._errors), "coalescing": self._flights.stats()}
+
+    def metrics_text(self) -> str:
+        """stats() in the Prometheus text format, for whatever scrapes or displays it."""
+        lines = []
+        for upstream, s in sorted(self.stats()["upstreams"].items()):
+            label = f'upstream="{upstream}"'
+            for outcome in ("ok", "failed", "short_circuited"):
+                lines.append(f'upstream_calls_total{{{label},outcome="{outcome}"}} {s.get(outcome, 0)}')
+            lines.append(f"upstream_retries_total{{{label}}} {s.get('retries', 0)}")
+            for kind, n in sorted(s.get("errors", {}).items()):
+                lines.append(f'upstream_errors_total{{{label},kind="{kind}"}} {n}')
+            latency = s.get("latency")
+            if latency:
+                for bound, n in latency["buckets"].items():
+                    lines.append(f'upstream_latency_ms_bucket{{{label},le="{bound}"}} {n}')
+                lines.append(f"upstream_latency_ms_sum{{{label}}} {latency['sum_ms']}")
+                lines.append(f"upstream_latency_ms_count{{{label}}} {latency['count']}")
+            state = s.get("breaker", {}).get("state", CircuitBreaker.CLOSED)
+            for name in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN):
+                lines.append(f'upstream_breaker_state{{{label},state="{name}"}} {int(state == name)}')
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _retry_after(r: requests.Response):
+    """Seconds from a Retry-After header in its numeric form, else None."""
+    try:
+        return float(r.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+# One client per process, shared by every session
+CLIENT = HttpClient()
+
+
+def get(url: str, params: dict = None, headers: dict = None, timeout=None, retries: int = None) -> requests.Response:
+    return CLIENT.get(url, params=params, headers=headers, timeout=timeout, retries=retries)
+
+
+def get_json(url: str, params: dict = None, headers: dict = None, timeout=None, retries: int = None):
+    return CLIENT.get_json(url, params=params, headers=headers, timeout=timeout, retries=retries)
@@ -0,0 +1,182 @@
+"""
+🌤️ LIVE DATA
+Banjul weather from Open-Meteo (current conditions and the 7-day forecast in one request)
+and exchange rates from Frankfurter, kept fresh by a background thread and saved to the
+shared API cache, so restarts and other workers start from the last good values
+Pages always get the last good value straight away, with its age - they never wait on the network
+"""
+
+import threading
+import time
+
+from cache import SingleFlight
+from http_client import BASE_URLS, UpstreamError, get_json
+from response_cache import API_CACHE
+
+WEATHER_URL = f"{BASE_URLS['open-meteo']}/v1/forecast"
+WEATHER_PARAMS = {
+    "latitude": 13.4549, "longitude": -16.5790, "timezone": "GMT", "forecast_days": 7,
+    "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m",
+    "daily": "temperature_2m_max,temperature_2m_min,precipitation_probability_max,weather_code",
+}
+RATES_URL = f"{BASE_URLS['frankfurter']}/latest"
+RATES_PARAMS = {"from": "EUR", "to": "USD,GBP"}
+GMD_PER_EUR = 70.0
+
+WEATHER_TTL = 1800  # seconds before a forecast counts as stale
+RATES_TTL = 3600
+REFRESH_AHEAD = 0.8  # refresh once a value is this far into its TTL, so visitors never see it expire
+RETRY_INTERVAL = 60  # after a failure, seconds before the upstream is tried again
+REFRESH_CHECK_INTERVAL = 15  # seconds between the refresher's checks
+
+FALLBACK_WEATHER = {"temperature": 28, "humidity": 70, "wind_speed": 15, "weather_code": 0, "daily": []}
+FALLBACK_RATES = {"EUR": {"rate": 70, "symbol": "€"}, "USD": {"rate": 65, "symbol": "$"}, "GBP": {"rate": 82, "symbol": "£"}}
+
+
+def parse_weather(data: dict) -> dict:
+    """Open-Meteo's current + daily blocks as the flat dict the pages use.
+
+    daily is one {"date", "max", "min", "rain", "code"} per day; days with a
+    missing value are left out rather than shown as None.
+    """
+    c = data.get("current", {})
+    d = data.get("daily", {})
+    days = zip(d.get("time", []), d.get("temperature_2m_max", []), d.get("temperature_2m_min", []),
+               d.get("precipitation_probability_max", []), d.get("weather_code", []))
+    return {
+        "temperature": c.get("temperature_2m", 28), "humidity": c.get("relative_humidity_2m", 70),
+        "wind_speed": c.get("wind_speed_10m", 15), "weather_code": c.get("weather_code", 0),
+        "daily": [{"date": date, "max": hi, "min": lo, "rain": rain, "code": code or 0}
+                  for date, hi, lo, rain, code in days if None not in (hi, lo, rain)],
+    }
+
+
+def fetch_weather() -> dict:
+    """One Open-Meteo request for current conditions and the forecast; raises UpstreamError."""
+    return parse_weather(get_json(WEATHER_URL, params=WEATHER_PARAMS))
+
+
+def fetch_rates() -> dict:
+    """GMD per EUR, USD and GBP from Frankfurter's EUR rates; raises UpstreamError."""
+    rates = get_json(RATES_URL, params=RATES_PARAMS).get("rates", {})
+    return {"EUR": {"rate": GMD_PER_EUR, "symbol": "€"}, "USD": {"rate": GMD_PER_EUR / rates.get("USD", 1.1), "symbol": "$"},
+            "GBP": {"rate": GMD_PER_EUR / rates.get("GBP", 0.85), "symbol": "£"}}
+
+
+class LiveDataset:
+    """The last good value of one upstream dataset, refreshed before it goes stale.
+
+    get() never fetches: it returns the value (or the fallback, before any
+    worker has fetched it) with "success", "fetched_at", "age" and "stale"
+    added. refresh() does the fetching, from the refresher thread; a failed
+    refresh keeps the old value and records the error. With a store, values
+    are saved under key and a newer one saved by another worker is used
+    instead of fetching again.
+    """
+
+    def __init__(self, name: str, key: str, fetch, fallback: dict, ttl: float, store=None, clock=time.time):
+        self.name = name
+        self.key = key
+        self.fetch = fetch
+        self.fallback = fallback
+        self.ttl = ttl
+        self.store = store
+        self._clock = clock
+        self._flight = SingleFlight()
+        self._loaded = False
+        self.value = None
+        self.fetched_at = None
+        self.last_attempt = None
+        self.error = None
+
+    def load(self) -> bool:
+        """Take the stored value if it is newer than ours; returns True if it was."""
+        self._loaded = True
+        entry = self.store.get(self.key) if self.store is not None else None
+        if entry is None or (self.fetched_at is not None and entry["fetched_at"] <= self.fetched_at):
+            return False
+        self.value, self.fetched_at = entry["value"], entry["fetched_at"]
+        return True
+
+    def get(self) -> dict:
+        if not self._loaded:
+            self.load()
+        value, fetched_at, error = self.value, self.fetched_at, self.error
+        if value is None:
+            return dict(self.fallback, success=False, fetched_at=None, age=None, stale=True, error=error)
+        age = self._clock() - fetched_at
+        return dict(value, success=True, fetched_at=fetched_at, age=age, stale=age > self.ttl, error=error)
+
+    def due(self) -> bool:
+        """True if the value is missing or nearly stale, and no failure was just retried."""
+        now = self._clock()
+        if self.last_attempt is not None and self.error is not None and now - self.last_attempt < RETRY_INTERVAL:
+            return False
+        return self.fetched_at is None or now - self.fetched_at >= self.ttl * REFRESH_AHEAD
+
+    def refresh(self) -> bool:
+        """Fetch a new value now; returns True if it succeeded. Concurrent calls share one fetch."""
+        return self._flight.do(self.key, self._refresh)
+
+    def _refresh(self) -> bool:
+        try:
+            if self.load() and not self.due():  # another worker has just refreshed it
+                return True
+            value = self.fetch()
+        except UpstreamError as e:
+            print(f"{self.name} refresh failed, serving the last good value: {e}")
+            self.last_attempt, self.error = self._clock(), e.to_dict()
+            return False
+        self.value, self.fetched_at = value, self._clock()
+        self.last_attempt, self.error = self.fetched_at, None
+        if self.store is not None:
+            self.store.set(self.key, value, self.ttl, fetched_at=self.fetched_at)
+        return True
+
+
+WEATHER = LiveDataset("Weather", "open-meteo:banjul", fetch_weather, FALLBACK_WEATHER, WEATHER_TTL, store=API_CACHE)
+RATES = LiveDataset("Exchange rates", "frankfurter:eur", fetch_rates, FALLBACK_RATES, RATES_TTL, store=API_CACHE)
+DATASETS = (WEATHER, RATES)
+
+_REFRESHER = None
+_REFRESHER_LOCK = threading.Lock()
+
+
+def refresh_due(datasets=DATASETS) -> int:
+    """Refresh every dataset that is due; returns how many were refreshed."""
+    return sum(dataset.refresh() for dataset in datasets if dataset.due())
+
+
+def start_refresher(interval: float = REFRESH_CHECK_INTERVAL, tasks=()) -> threading.Thread:
+    """Start (once per process) the thread that keeps every dataset fresh; it fetches them right away.
+
+    tasks are extra callables run on the same timer, such as flushing the query log.
+    """
+    global _REFRESHER
+    with _REFRESHER_LOCK:
+        if _REFRESHER is None or not _REFRESHER.is_alive():
+            def refresh():
+                while True:
+                    try:
+                        refresh_due()
+                    except Exception as e:  # keep serving the last good values
+                        print(f"Live data refresh failed: {e}")
+                    for task in tasks:
+                        try:
+                            task()
+                        except Exception as e:
+                            print(f"Refresher task {getattr(task, '__name__', task)} failed: {e}")
+                    time.sleep(interval)
+            _REFRESHER = threading.Thread(target=refresh, name="live-data-refresher", daemon=True)
+            _REFRESHER.start()
+    return _REFRESHER
+
+
+def get_weather() -> dict:
+    """Current weather and 7-day forecast for Banjul - the last good value, never a network call."""
+    return WEATHER.get()
+
+
+def get_rates() -> dict:
+    """GMD exchange rates - the last good value, never a network call."""
+    return RATES.get()
@@ -0,0 +1,119 @@
+"""
+📒 QUERY LOG
+What travelers searched for, which tier answered and whether Wikipedia had to step in
+Records sit in a ring buffer and are appended to a JSON Lines file in batches
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+# Set TGTA_QUERY_LOG to another file, or to an empty string to switch logging off
+QUERY_LOG_PATH = os.environ.get("TGTA_QUERY_LOG", str(Path(__file__).parent / "logs" / "queries.jsonl"))
+QUERY_LOG_CAPACITY = 1024  # records held in memory; the oldest are dropped if the disk can't keep up
+QUERY_LOG_BATCH = 64  # records written per flush
+QUERY_LOG_INTERVAL = 30.0  # seconds before a partial batch is written anyway (see flush_due)
+
+MISS_CONFIDENCE = 0.5  # below this the results page does not use the knowledge base answer
+
+
+class QueryLog:
+    """Thread-safe ring buffer of query records, flushed to an append-only file.
+
+    record() only appends to a deque; the file is opened once per batch, so
+    logging costs a few microseconds per search. With no path nothing is written.
+    """
+
+    def __init__(self, path=QUERY_LOG_PATH, capacity: int = QUERY_LOG_CAPACITY, batch: int = QUERY_LOG_BATCH,
+                 interval: float = QUERY_LOG_INTERVAL):
+        self.path = Path(path) if path else None
+        self.batch = batch
+        self.interval = interval
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+
+    def record(self, query: str, tier=None, confidence: float = 0.0, latency_ms: float = 0.0,
+               wikipedia: bool = False, found: bool = True, matched=None):
+        """Log one search: the normalized query, the tier and answer that won, and what happened next.
+
+        found is None when Wikipedia had an article but couldn't be reached - not a gap in what we know.
+        """
+        if self.path is None:
+            return
+        entry = {
+            "ts": round(time.time(), 3), "query": query, "matched": matched, "tier": tier,
+            "confidence": round(confidence or 0.0, 3), "latency_ms": round(latency_ms, 3),
+            "wikipedia": wikipedia, "found": found,
+        }
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(entry)
+            self.recorded += 1
+            due = len(self._buffer) >= self.batch or time.monotonic() - self._last_flush >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Append every buffered record to the file; returns how many were written."""
+        if self.path is None:
+            return 0
+        with self._lock:
+            entries = list(self._buffer)
+            self._buffer.clear()
+            self._last_flush = time.monotonic()
+        if not entries:
+            return 0
+        lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:  # a read-only deploy loses the log, not the search
+            print(f"Query log flush failed: {e}")
+            return 0
+        self.written += len(entries)
+        return len(entries)
+
+    def flush_due(self) -> int:
+        """Write a partial batch once it has waited QUERY_LOG_INTERVAL - called on a timer, so quiet
+        periods and a SIGTERM (which skips atexit) lose at most one interval of searches."""
+        with self._lock:
+            due = self._buffer and time.monotonic() - self._last_flush >= self.interval
+        return self.flush() if due else 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"buffered": len(self._buffer), "recorded": self.recorded, "written": self.written,
+                    "dropped": self.dropped, "path": str(self.path) if self.path else None}
+
+
+def read_log(path=QUERY_LOG_PATH):
+    """Yield the records in a query log file, skipping lines cut short by a crash."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def is_miss(entry: dict) -> bool:
+    """True if the knowledge base had no usable answer for this search."""
+    return entry.get("confidence", 0) < MISS_CONFIDENCE
+
+
+# One log per process, shared by every session
+QUERY_LOG = QueryLog()
+atexit.register(QUERY_LOG.flush)
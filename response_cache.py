@@ -0,0 +1,133 @@
+"""
+🗄️ API RESPONSE CACHE
+Upstream API values on disk, in SQLite (WAL mode), shared by every worker process on the
+host and kept across restarts - a fresh worker starts with the last good weather and rates
+Entries keep their TTL, stay available as last-good fallbacks after it, and are evicted
+least recently used first, or once they are too old to be worth showing
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Set TGTA_API_CACHE to another file, or to an empty string to keep API values in memory only
+API_CACHE_PATH = os.environ.get("TGTA_API_CACHE", str(Path(__file__).parent / "state" / "api_cache.sqlite3"))
+API_CACHE_MAX_ENTRIES = 1000
+API_CACHE_MAX_STALE = 7 * 86400  # seconds past its TTL an entry is still kept as a fallback
+BUSY_TIMEOUT_MS = 5000  # how long a write waits for another worker's write to finish
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class ResponseCache:
+    """Key -> JSON value with fetch and expiry times, in one SQLite file.
+
+    get() returns expired entries too - with "fresh": False - so callers can
+    fall back to the last good value. Each thread gets its own connection;
+    WAL mode lets readers in every process carry on while one writes. With no
+    path, or a disk that can't be written, it stores nothing.
+    """
+
+    def __init__(self, path=API_CACHE_PATH, max_entries: int = API_CACHE_MAX_ENTRIES,
+                 max_stale: float = API_CACHE_MAX_STALE, clock=time.time):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self._clock = clock
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None and self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:  # a read-only deploy keeps API values in memory only
+                print(f"API cache disabled: {e}")
+                self.path = None
+                return None
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        """{"value", "fetched_at", "expires_at", "fresh"} for key, or None if it was never stored."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT value, fetched_at, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = self._clock()
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"API cache read failed: {e}")
+            return None
+        value, fetched_at, expires_at = row
+        return {"value": json.loads(value), "fetched_at": fetched_at, "expires_at": expires_at, "fresh": now < expires_at}
+
+    def set(self, key: str, value, ttl: float, fetched_at: float = None):
+        """Store a JSON-serializable value, fresh for ttl seconds from fetched_at (default now)."""
+        conn = self._connect()
+        if conn is None:
+            return
+        now = self._clock()
+        fetched_at = now if fetched_at is None else fetched_at
+        try:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (key, json.dumps(value, ensure_ascii=False), fetched_at, fetched_at + ttl, now))
+        except sqlite3.Error as e:
+            print(f"API cache write failed: {e}")
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop entries past max_stale, then the least recently used beyond max_entries."""
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            with conn:
+                old = conn.execute("DELETE FROM responses WHERE expires_at < ?", (self._clock() - self.max_stale,)).rowcount
+                extra = conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)).rowcount
+        except sqlite3.Error as e:
+            print(f"API cache eviction failed: {e}")
+            return 0
+        return old + extra
+
+    def delete(self, key: str):
+        conn = self._connect()
+        if conn is not None:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        conn = self._connect()
+        if conn is not None:
+            conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        conn = self._connect()
+        return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if conn is not None else 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self), "max_entries": self.max_entries, "path": str(self.path) if self.path else None}
+
+
+# One cache per process, backed by the file every worker shares
+API_CACHE = ResponseCache()
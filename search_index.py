@@ -0,0 +1,513 @@
+"""
+🔎 SEARCH INDEXES
+Lookup structures for the knowledge base matcher
+Everything here is built once per process and then only read
+"""
+
+import math
+from collections import Counter, deque
+
+try:
+    import numpy as np
+except ImportError:  # the TF-IDF tier is skipped without NumPy
+    np = None
+
+from tokenizer import STOPWORDS, terms as tokenize_terms, tokenize
+
+HAVE_NUMPY = np is not None
+
+
+def document_terms(key: str, text: str, key_weight: int = 3) -> Counter:
+    """Term counts of one answer, with the words of its key counted key_weight times."""
+    return Counter(tokenize_terms(key) * key_weight + tokenize_terms(text))
+
+# =============================================================================
+# KEYWORD AUTOMATON - every KEYWORD_MAP hit in one pass over the query
+# =============================================================================
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of keyword phrases.
+
+    Keywords keep their insertion order as a tie-breaker, so "longest keyword
+    wins, first one listed on a tie" behaves exactly like the old sorted scan.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        seen = set()
+        for keyword in keywords:
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (len(self.keywords),)
+        self.keywords.append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> set:
+        """Indexes of every keyword that occurs somewhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        hits = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
+
+    def matches(self, text: str) -> list:
+        """Keywords found in text, best first (longest, then earliest listed)."""
+        keywords = self.keywords
+        hits = sorted(self.find_all(text), key=lambda i: (-len(keywords[i]), i))
+        return [keywords[i] for i in hits]
+
+    def longest(self, text: str):
+        """The single best keyword found in text, or None."""
+        hits = self.find_all(text)
+        if not hits:
+            return None
+        keywords = self.keywords
+        return keywords[min(hits, key=lambda i: (-len(keywords[i]), i))]
+
+
+# =============================================================================
+# BM25 INDEX - rank answers by their full text, not just the key
+# =============================================================================
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of {key: text} documents.
+
+    The key is indexed along with the text and repeated key_weight times,
+    so a word in the question the answer is filed under counts for more
+    than the same word somewhere in the body. Pass term_counts (from
+    document_terms) to reuse tokenization done for an earlier build.
+    """
+
+    def __init__(self, documents: dict, k1: float = 1.5, b: float = 0.75, key_weight: int = 3, term_counts: dict = None):
+        self.k1 = k1
+        self.b = b
+        self.keys = list(documents)
+        self.postings = {}
+        self.doc_lengths = []
+
+        for doc_id, key in enumerate(self.keys):
+            counts = term_counts[key] if term_counts else document_terms(key, documents[key], key_weight)
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+
+        count = len(self.keys)
+        self.avg_length = sum(self.doc_lengths) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+        # Length normalisation only depends on the document, so do it once
+        self._norm = [
+            k1 * (1 - b + b * length / self.avg_length) if self.avg_length else k1
+            for length in self.doc_lengths
+        ]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def scores(self, query) -> dict:
+        """BM25 score for every document sharing at least one term with query.
+
+        query is raw text or an already tokenized sequence of terms.
+        """
+        if isinstance(query, str):
+            query = tokenize_terms(query)
+        totals = {}
+        k1_plus_1 = self.k1 + 1
+        norm = self._norm
+        for term in dict.fromkeys(query):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in docs:
+                totals[doc_id] = totals.get(doc_id, 0.0) + idf * tf * k1_plus_1 / (tf + norm[doc_id])
+        return totals
+
+    def search(self, query, k: int = 5) -> list:
+        """Top k (key, score) pairs, best first."""
+        totals = self.scores(query)
+        best = sorted(totals, key=totals.get, reverse=True)[:k]
+        return [(self.keys[doc_id], totals[doc_id]) for doc_id in best]
+
+
+# =============================================================================
+# SPELLING INDEX - SymSpell-style typo correction for place names and keywords
+# =============================================================================
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if limit <= 1:
+        return _distance_up_to_one(a, b)
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+def _distance_up_to_one(a: str, b: str) -> int:
+    """0, 1 or 2 (meaning "more than one") in a single scan - the common case for typos."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    i = 0
+    while i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) != len(b):
+        return 1 if a[i + 1:] == b[i:] else 2
+    if a[i + 1:] == b[i + 1:]:
+        return 1
+    if i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]:
+        return 1
+    return 2
+
+
+def _deletes(word: str, distance: int) -> set:
+    """Every string reachable from word by deleting up to distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+class SpellingIndex:
+    """Corrects misspelled query words against a fixed vocabulary.
+
+    Every vocabulary word is stored under all its deletes up to the maximum
+    edit distance (SymSpell), so a lookup only generates the deletes of the
+    typed word and checks a handful of candidates - no scan over the vocabulary.
+
+    Words in known_words (plus the vocabulary and stopwords) are never
+    touched, so ordinary English like "coast" is not "fixed" into "cost".
+    Words shorter than FREE_FIRST_LETTER also have to keep their first
+    letter: typos there are rare, and otherwise almost any short word is one
+    edit from something ("post" -> "cost", "test" -> "best").
+    """
+
+    MEMO_SIZE = 4096
+    FREE_FIRST_LETTER = 5  # shortest word whose first letter a correction may change
+
+    def __init__(self, vocabulary, known_words=()):
+        self.counts = Counter(w for w in vocabulary if len(w) >= 4 and w.isalpha())
+        self.known = set(known_words) | set(self.counts) | STOPWORDS
+        self._deletes = {}
+        self._memo = {}
+        for word in self.counts:
+            for variant in _deletes(word, self.max_distance(len(word))):
+                self._deletes.setdefault(variant, []).append(word)
+
+    @staticmethod
+    def max_distance(length: int) -> int:
+        if length >= 8:
+            return 2
+        if length >= 4:
+            return 1
+        return 0
+
+    def correct_word(self, word: str) -> str:
+        """The closest vocabulary word, or word itself if it is known or nothing is close."""
+        if word in self.known or not word.isalpha():
+            return word
+        corrected = self._memo.get(word)
+        if corrected is None:
+            corrected = self._lookup(word)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = corrected
+        return corrected
+
+    def _lookup(self, word: str) -> str:
+        # Widen one edit at a time - most typos are a single edit away,
+        # and a distance-1 hit can never be beaten by a distance-2 one
+        variants = frontier = {word}
+        for distance in range(1, self.max_distance(len(word)) + 1):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants = variants | frontier
+            candidates = {c for v in variants for c in self._deletes.get(v, ())}
+            best = [
+                (-self.counts[c], c) for c in candidates
+                if (c[0] == word[0] or len(word) >= self.FREE_FIRST_LETTER) and edit_distance(word, c, distance) <= distance
+            ]
+            if best:
+                return min(best)[1]
+        return word
+
+    def correct_words(self, words) -> list:
+        return [self.correct_word(w) for w in words]
+
+    def correct(self, text: str) -> str:
+        """Normalized text with every misspelled word replaced."""
+        return " ".join(self.correct_words(tokenize(text).words))
+
+
+# =============================================================================
+# TF-IDF MATRIX - cosine similarity against every answer in one product
+# =============================================================================
+
+
+class TfidfIndex:
+    """Sparse TF-IDF vectors of {key: text} documents, scored with NumPy per query.
+
+    Each term keeps a posting list of (document, weight) arrays, so a query
+    only touches the documents that share one of its terms, and memory grows
+    with the number of distinct words per answer - not vocabulary x answers.
+    """
+
+    def __init__(self, documents: dict, key_weight: int = 3, term_counts: dict = None):
+        self.keys = list(documents)
+        self.vocabulary = {}
+        counts = []
+        for key in self.keys:
+            tf = term_counts[key] if term_counts else document_terms(key, documents[key], key_weight)
+            counts.append(tf)
+            for term in tf:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        docs = len(self.keys)
+        df = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for tf in counts:
+            df[[self.vocabulary[t] for t in tf]] += 1
+        self.idf = np.log((1 + docs) / (1 + df)) + 1
+
+        # Unit-length document vectors, then transposed into one posting list per term
+        rows, ids, values = [], [], []
+        for doc_id, tf in enumerate(counts):
+            if not tf:
+                continue
+            terms = np.fromiter((self.vocabulary[t] for t in tf), dtype=np.int64, count=len(tf))
+            weights = (1 + np.log(np.fromiter(tf.values(), dtype=np.float32, count=len(tf)))) * self.idf[terms]
+            rows.append(terms)
+            ids.append(np.full(len(tf), doc_id, dtype=np.int32))
+            values.append(weights / np.linalg.norm(weights))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        self._doc_ids = np.concatenate(ids)[order] if ids else np.zeros(0, dtype=np.int32)
+        self._weights = np.concatenate(values)[order] if values else np.zeros(0, dtype=np.float32)
+        self._starts = np.searchsorted(rows[order], np.arange(len(self.vocabulary) + 1))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def postings(self, term_id: int) -> tuple:
+        """(document ids, weights) of every document containing the term."""
+        start, end = self._starts[term_id], self._starts[term_id + 1]
+        return self._doc_ids[start:end], self._weights[start:end]
+
+    def document_frequency(self, term_id: int) -> int:
+        return int(self._starts[term_id + 1] - self._starts[term_id])
+
+    def similarities(self, query):
+        """Cosine similarity of query (raw text or a sequence of terms) to every document."""
+        return self._score(query)[0]
+
+    def _score(self, query) -> tuple:
+        """(similarities, number of distinct query terms each document contains)."""
+        if isinstance(query, str):
+            query = tokenize_terms(query)
+        tf = Counter(t for t in query if t in self.vocabulary)
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        shared = np.zeros(len(self.keys), dtype=np.int32)
+        if not tf:
+            return scores, shared
+        rows = [self.vocabulary[t] for t in tf]
+        vector = (1 + np.log(np.fromiter(tf.values(), dtype=np.float32))) * self.idf[rows]
+        vector /= np.linalg.norm(vector)
+        for term_id, weight in zip(rows, vector):
+            ids, weights = self.postings(term_id)
+            scores[ids] += weight * weights
+            shared[ids] += 1
+        return scores, shared
+
+    def search(self, query, k: int = 5, min_terms: int = 1) -> list:
+        """Top k (key, similarity) pairs with similarity > 0, best first.
+
+        Documents sharing fewer than min_terms distinct terms with the query
+        are left out, so one common word can't make a match on its own.
+        """
+        sims, shared = self._score(query)
+        if min_terms > 1:
+            sims[shared < min_terms] = 0
+        if k < len(sims):
+            top = np.argpartition(-sims, k)[:k]
+        else:
+            top = np.arange(len(sims))
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [(self.keys[i], float(sims[i])) for i in top if sims[i] > 0]
+
+
+# =============================================================================
+# RELATED TOPICS - each answer's nearest neighbours, computed once per build
+# =============================================================================
+
+
+def related_topics(keys, tags: dict, tfidf: TfidfIndex = None, n: int = 5, tag_weight: float = 0.5,
+                   max_df: int = 100) -> dict:
+    """The n most related other keys for every key, best first.
+
+    Relatedness is the cosine similarity of the two answers' TF-IDF vectors
+    plus tag_weight times the Jaccard overlap of their tags (the words of the
+    keywords that lead to each answer). tfidf must be built over the same
+    keys in the same order; without one only the tags count.
+
+    Words found in more than max_df answers are left out of both scores:
+    they say little about how two answers relate, and skipping them keeps
+    the work per answer bounded however large the knowledge base grows.
+    Below max_df answers nothing is skipped and the scores are exact.
+    """
+    keys = list(keys)
+    tag_sets = [tags.get(key, frozenset()) for key in keys]
+    tagged = {}
+    for doc_id, words in enumerate(tag_sets):
+        for word in words:
+            tagged.setdefault(word, []).append(doc_id)
+
+    # Each document's own sparse vector, restricted to the informative terms
+    vectors = [([], []) for _ in keys]
+    if tfidf is not None:
+        for term_id in range(len(tfidf.vocabulary)):
+            if tfidf.document_frequency(term_id) <= max_df:
+                ids, weights = tfidf.postings(term_id)
+                for doc_id, weight in zip(ids.tolist(), weights.tolist()):
+                    vectors[doc_id][0].append(term_id)
+                    vectors[doc_id][1].append(weight)
+
+    related = {}
+    for doc_id, key in enumerate(keys):
+        scores = {}
+        mine = tag_sets[doc_id]
+        shared = Counter(other for word in mine if len(tagged[word]) <= max_df for other in tagged[word])
+        for other, count in shared.items():
+            scores[other] = tag_weight * count / (len(mine) + len(tag_sets[other]) - count)
+
+        term_ids, weights = vectors[doc_id]
+        if term_ids:
+            postings = [tfidf.postings(term_id) for term_id in term_ids]
+            ids = np.concatenate([p[0] for p in postings])
+            products = np.concatenate([p[1] * weight for p, weight in zip(postings, weights)])
+            others, inverse = np.unique(ids, return_inverse=True)
+            for other, similarity in zip(others.tolist(), np.bincount(inverse, products).tolist()):
+                scores[other] = scores.get(other, 0.0) + similarity
+
+        scores.pop(doc_id, None)
+        best = sorted(scores, key=lambda other: (-scores[other], other))[:n]
+        related[key] = tuple(keys[other] for other in best if scores[other] > 0)
+    return related
+
+
+# =============================================================================
+# PREFIX TRIE - autocomplete while the user types
+# =============================================================================
+
+
+class PrefixTrie:
+    """Prefix completion over a fixed set of phrases.
+
+    Every node keeps its best few completions, so a lookup is one walk down
+    the typed prefix - no subtree search, however many phrases there are.
+    Phrases also complete from the start of any later word ("kinteh" ->
+    "kunta kinteh island"), listed after phrases that start with the prefix.
+    """
+
+    def __init__(self, phrases, limit: int = 16):
+        """phrases are (text, value, priority) triples; a lower priority is listed first."""
+        self.limit = limit
+        self.values = []
+        self._children = [{}]
+        self._best = [[]]
+
+        suffixes = []
+        for text, value, priority in phrases:
+            words = tokenize(text).words
+            if not words:
+                continue
+            entry = len(self.values)
+            self.values.append(value)
+            length = sum(map(len, words)) + len(words) - 1
+            for start in range(len(words)):
+                suffixes.append(((start > 0, priority, length, entry), " ".join(words[start:])))
+
+        # Inserting best-first means a node's list is final once it is full
+        suffixes.sort()
+        children, best = self._children, self._best
+        for (_, _, _, entry), suffix in suffixes:
+            node = 0
+            for ch in suffix:
+                nxt = children[node].get(ch)
+                if nxt is None:
+                    nxt = len(children)
+                    children[node][ch] = nxt
+                    children.append({})
+                    best.append([])
+                node = nxt
+                found = best[node]
+                if len(found) < limit and entry not in found:
+                    found.append(entry)
+
+    def __len__(self):
+        return len(self.values)
+
+    def complete(self, prefix: str, k: int = None) -> list:
+        """Values of the phrases completing prefix, best first (at most limit of them)."""
+        node = 0
+        children = self._children
+        for ch in tokenize(prefix).normalized:
+            node = children[node].get(ch)
+            if node is None:
+                return []
+        values = self.values
+        return [values[entry] for entry in self._best[node][:k]]
@@ -0,0 +1,46 @@
+"""
+✂️ QUERY TOKENIZER
+One regex pass turns a query into words, search terms and a normalized string
+Shared by the matcher, the suggestions and every search index
+"""
+
+import re
+from typing import NamedTuple
+
+# Letters and digits in any script ("côte" stays one word); everything else separates words
+_WORD_RE = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "at", "be", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when", "where",
+    "which", "who", "why", "with", "you", "your",
+})
+
+
+class Tokens(NamedTuple):
+    """A tokenized query."""
+
+    words: tuple  # every word, lowercased, in order
+    terms: tuple  # words minus stopwords - what the indexes search on
+    normalized: str  # words joined by single spaces - the canonical form of the query
+
+    def ngrams(self, n: int) -> list:
+        """Word n-grams as space-joined strings, e.g. ngrams(2) of "kunta kinteh island"."""
+        words = self.words
+        return [" ".join(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+
+def from_words(words) -> Tokens:
+    """Tokens for an already-split list of lowercase words."""
+    words = tuple(words)
+    return Tokens(words, tuple([w for w in words if w not in STOPWORDS]), " ".join(words))
+
+
+def tokenize(text: str) -> Tokens:
+    """Split text into words, search terms and a normalized string in one pass."""
+    return from_words(_WORD_RE.findall(text.lower()))
+
+
+def terms(text: str) -> tuple:
+    """Just the search terms of text."""
+    return tuple([w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS])
@@ -0,0 +1,94 @@
+"""
+📊 KNOWLEDGE BASE GAP REPORT
+Reads the query log and lists the questions the knowledge base missed most often,
+with the closest existing answer for each - the best candidates for new keywords
+
+Run: python tools/kb_gap_report.py [logs/queries.jsonl] [--top 20] [--json]
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from knowledge_base import KEYWORD_MAP, rank_answers  # noqa: E402
+from query_log import QUERY_LOG_PATH, is_miss, read_log  # noqa: E402
+from tokenizer import tokenize  # noqa: E402
+
+
+def gap_report(entries, top: int = 20) -> dict:
+    """Aggregate query log entries into miss counts per query and per word."""
+    searches = misses = wiki_calls = not_found = 0
+    missed = defaultdict(lambda: {"count": 0, "wikipedia": 0, "not_found": 0, "latency_ms": 0.0})
+    for entry in entries:
+        searches += 1
+        wiki_calls += bool(entry.get("wikipedia"))
+        not_found += entry.get("found") is False
+        if not is_miss(entry):
+            continue
+        misses += 1
+        stats = missed[entry.get("query", "")]
+        stats["count"] += 1
+        stats["wikipedia"] += bool(entry.get("wikipedia"))
+        stats["not_found"] += entry.get("found") is False
+        stats["latency_ms"] += entry.get("latency_ms", 0.0)
+
+    # Words that keep turning up in misses and no keyword covers yet
+    keyword_words = {word for keyword in KEYWORD_MAP for word in tokenize(keyword).words}
+    missed_words = Counter()
+    for query, stats in missed.items():
+        for word in set(tokenize(query).terms) - keyword_words:
+            missed_words[word] += stats["count"]
+
+    queries = []
+    for query, stats in sorted(missed.items(), key=lambda item: -item[1]["count"])[:top]:
+        closest = rank_answers(query, k=1)
+        queries.append({
+            "query": query, "count": stats["count"], "wikipedia": stats["wikipedia"],
+            "not_found": stats["not_found"], "avg_latency_ms": round(stats["latency_ms"] / stats["count"], 3),
+            "closest_answer": closest[0]["matched"] if closest else None,
+            "closest_confidence": closest[0]["confidence"] if closest else 0,
+        })
+    return {
+        "searches": searches, "misses": misses, "miss_rate": misses / searches if searches else 0.0,
+        "wikipedia_calls": wiki_calls, "not_found": not_found,
+        "top_missed_queries": queries, "top_missed_words": missed_words.most_common(top),
+    }
+
+
+def print_report(report: dict):
+    print(f"{report['searches']} searches, {report['misses']} misses ({report['miss_rate']:.1%}), "
+          f"{report['wikipedia_calls']} Wikipedia calls, {report['not_found']} with no answer at all")
+    print()
+    print(f"{'count':>6} | {'wiki':>5} | {'none':>5} | {'query':<40} | closest answer")
+    print("-" * 90)
+    for q in report["top_missed_queries"]:
+        closest = f"{q['closest_answer']} ({q['closest_confidence']:.2f})" if q["closest_answer"] else "-"
+        print(f"{q['count']:>6} | {q['wikipedia']:>5} | {q['not_found']:>5} | {q['query'][:40]:<40} | {closest}")
+    print()
+    print("Most missed words without a keyword - add them to knowledge/keywords.json:")
+    for word, count in report["top_missed_words"]:
+        print(f"  {count:>5}  {word}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", default=QUERY_LOG_PATH, help="query log file")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    if not args.path or not Path(args.path).exists():
+        sys.exit(f"No query log at {args.path!r} - run the app with TGTA_QUERY_LOG set first")
+    report = gap_report(read_log(args.path), top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
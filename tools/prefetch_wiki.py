@@ -0,0 +1,38 @@
+"""
+📚 WIKIPEDIA SNAPSHOT PREFETCH
+Downloads the summary and thumbnail of every article in GAMBIA_WIKI_MAP, in parallel,
+into knowledge/wikipedia.json - run before a deploy so the app ships with the snapshot
+Against a stand-in Wikipedia (TGTA_UPSTREAM_URL) it writes the app's own state copy instead
+
+Run: python tools/prefetch_wiki.py [--max-age HOURS] [--workers 8] [--output PATH]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import wiki  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-age", type=float, default=0, help="only refetch articles older than this many hours (default: all)")
+    parser.add_argument("--workers", type=int, default=wiki.PREFETCH_WORKERS, help="parallel downloads")
+    parser.add_argument("--output", type=Path, default=wiki.SNAPSHOT_PATH if wiki.TEST_UPSTREAM else wiki.SEED_PATH,
+                        help="snapshot file to update (default: the committed knowledge/wikipedia.json)")
+    args = parser.parse_args()
+
+    wiki.SNAPSHOT.clear()  # start from the output file alone, not what the app has cached under state/
+    result = wiki.refresh_snapshot(max_age=args.max_age * 3600, path=args.output, workers=args.workers)
+    print(f"{result['fetched']} articles fetched, {result['kept']} kept, {len(result['failed'])} failed "
+          f"- {len(wiki.SNAPSHOT)} in {args.output}")
+    for title in result["failed"]:
+        print(f"  failed: {title}")
+    if result["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
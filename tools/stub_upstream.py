@@ -0,0 +1,250 @@
+"""
+🧪 STUB UPSTREAM SERVER
+A local stand-in for Open-Meteo, Frankfurter and Wikipedia that replays recorded responses,
+with injected latency, errors and timeouts - for load tests and benchmarks on a box with no
+network, without hammering the real services
+
+Run: python tools/stub_upstream.py [--port 8765] [--latency-ms 50] [--error-rate 0.1] [--timeout-rate 0.05]
+     TGTA_UPSTREAM_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Each API is served under its own path (/open-meteo/v1/forecast, /wikipedia/api/rest_v1/...), the
+layout TGTA_UPSTREAM_URL expects; the real APIs' own paths work too.
+     python tools/stub_upstream.py --record      # capture fresh responses from the real APIs
+
+Faults can be set per API (--api open-meteo:error_rate=1) and changed while it runs:
+     curl -X POST localhost:8765/_stub/config -d '{"wikipedia": {"latency_ms": 2000}}'
+     curl localhost:8765/_stub/stats
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+RECORDINGS_PATH = Path(__file__).parent / "stub_responses.json"
+APIS = ("open-meteo", "frankfurter", "wikipedia")
+SUMMARY_PREFIX = "/api/rest_v1/page/summary/"
+THUMBNAIL_PREFIX = "/thumbnails/"
+THUMBNAIL_PNG = base64.b64decode(  # 1x1 green pixel
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGOwKtcAAAHIANqOl9V6AAAAAElFTkSuQmCC")
+
+FAULT_DEFAULTS = {
+    "latency_ms": 0.0,  # added to every response
+    "jitter_ms": 0.0,  # plus a random 0..jitter_ms
+    "error_rate": 0.0,  # share of requests answered with error_status
+    "error_status": 503,
+    "timeout_rate": 0.0,  # share of requests that hang for hang_s and then drop the connection
+    "hang_s": 30.0,
+}
+
+
+class StubUpstream(ThreadingHTTPServer):
+    """Serves recordings on the paths the real APIs use; faults are drawn from one seeded RNG.
+
+    Wikipedia articles that weren't recorded get a generated placeholder
+    summary, unless strict, in which case they are a 404 like a missing page.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, recordings: dict = None, faults: dict = None,
+                 seed: int = 0, strict: bool = False):
+        super().__init__((host, port), _Handler)
+        self.recordings = recordings if recordings is not None else load_recordings()
+        self.faults = {api: dict(FAULT_DEFAULTS) for api in APIS}
+        self.configure(faults or {})
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {api: {"requests": 0, "errors": 0, "timeouts": 0} for api in APIS}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def configure(self, faults: dict):
+        """Update faults: {"latency_ms": 50} for every API, or {"wikipedia": {"error_rate": 1}} for one."""
+        for key, value in faults.items():
+            if key in self.faults:
+                self.faults[key].update(value)
+            elif key in FAULT_DEFAULTS:
+                for api in APIS:
+                    self.faults[api][key] = value
+            else:
+                raise ValueError(f"unknown fault setting {key!r}")
+
+    def draw(self, api: str) -> tuple:
+        """(delay seconds, outcome) for one request: outcome is "ok", "error" or "timeout"."""
+        f = self.faults[api]
+        with self.lock:
+            stats = self.stats[api]
+            stats["requests"] += 1
+            delay = (f["latency_ms"] + self.rng.random() * f["jitter_ms"]) / 1000
+            roll = self.rng.random()
+            if roll < f["timeout_rate"]:
+                stats["timeouts"] += 1
+                return f["hang_s"], "timeout"
+            if roll < f["timeout_rate"] + f["error_rate"]:
+                stats["errors"] += 1
+                return delay, "error"
+        return delay, "ok"
+
+    def response(self, path: str, base: str = None):
+        """(api, status, body) for a request path; api is None for paths no upstream has.
+
+        base is the URL the Wikipedia thumbnails in summaries are served from.
+        """
+        prefix, _, rest = path[1:].partition("/")
+        if prefix in APIS:
+            api, status, body = self.response("/" + rest, f"{self.url}/{prefix}")
+            return (api, status, body) if api in (prefix, None) else (None, 404, {"error": f"no {prefix} stub for /{rest}"})
+        if path == "/v1/forecast":
+            return "open-meteo", 200, self.recordings["open-meteo"]
+        if path == "/latest":
+            return "frankfurter", 200, self.recordings["frankfurter"]
+        if path.startswith(THUMBNAIL_PREFIX):
+            return "wikipedia", 200, THUMBNAIL_PNG
+        if path.startswith(SUMMARY_PREFIX):
+            title = unquote(path[len(SUMMARY_PREFIX):])
+            summary = self.recordings["wikipedia"].get(title)
+            if summary is None and not self.strict:
+                summary = placeholder_summary(title)
+            if summary is None:
+                return "wikipedia", 404, {"type": "https://mediawiki.org/wiki/HyperSwitch/errors/not_found",
+                                          "title": "Not found.", "detail": "Page or revision not found."}
+            return "wikipedia", 200, json.loads(json.dumps(summary).replace("{base}", base or self.url))
+        return None, 404, {"error": f"no stub for {path}"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024  # headers and body in one write, or delayed ACKs stall keep-alive requests
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/_stub/stats":
+            with self.server.lock:
+                return self._send(200, {"stats": self.server.stats, "faults": self.server.faults})
+        api, status, body = self.server.response(path)
+        if api is None:
+            return self._send(status, body)
+        delay, outcome = self.server.draw(api)
+        time.sleep(delay)
+        if outcome == "timeout":
+            self.close_connection = True
+            return
+        if outcome == "error":
+            return self._send(self.server.faults[api]["error_status"], {"error": "injected by stub_upstream"})
+        self._send(status, body)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/_stub/config":
+            return self._send(404, {"error": "POST /_stub/config only"})
+        try:
+            faults = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            self.server.configure(faults)
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+        self._send(200, {"faults": self.server.faults})
+
+    def _send(self, status: int, body):
+        data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "image/png" if isinstance(body, bytes) else "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def placeholder_summary(title: str) -> dict:
+    name = title.replace("_", " ")
+    return {"type": "standard", "title": name, "displaytitle": name,
+            "extract": f"{name} is a place or topic in the Gambia. (Placeholder summary from the stub server.)",
+            "content_urls": {"desktop": {"page": f"https://en.wikipedia.org/wiki/{title}"}}}
+
+
+def load_recordings(path: Path = RECORDINGS_PATH) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def record(path: Path = RECORDINGS_PATH):
+    """Capture the responses the app asks for from the real APIs into the recordings file."""
+    import requests
+
+    from knowledge_base import GAMBIA_WIKI_MAP
+    from live_data import RATES_PARAMS, WEATHER_PARAMS
+
+    headers = {"User-Agent": "GambiaTravelAssistant/1.0"}
+    recordings = load_recordings(path)
+    recordings["open-meteo"] = requests.get("https://api.open-meteo.com/v1/forecast", params=WEATHER_PARAMS,
+                                            headers=headers, timeout=10).json()
+    recordings["frankfurter"] = requests.get("https://api.frankfurter.app/latest", params=RATES_PARAMS,
+                                             headers=headers, timeout=10).json()
+    for title in sorted(set(GAMBIA_WIKI_MAP.values())):
+        r = requests.get(f"https://en.wikipedia.org{SUMMARY_PREFIX}{title}", headers=headers, timeout=10)
+        if r.status_code != 200:
+            print(f"  skipped {title}: {r.status_code}")
+            continue
+        summary = r.json()
+        if "thumbnail" in summary:  # thumbnails are served by the stub, not Wikimedia
+            summary["thumbnail"]["source"] = "{base}" + THUMBNAIL_PREFIX + title + ".png"
+        summary.pop("originalimage", None)
+        recordings["wikipedia"][title] = summary
+    recordings["note"] = f"Recorded from the real APIs on {time.strftime('%Y-%m-%d')}."
+    Path(path).write_text(json.dumps(recordings, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Recorded weather, rates and {len(recordings['wikipedia'])} articles into {path}")
+
+
+def parse_api_faults(specs) -> dict:
+    """["open-meteo:error_rate=1,latency_ms=200"] -> {"open-meteo": {"error_rate": 1.0, "latency_ms": 200.0}}"""
+    faults = {}
+    for spec in specs or []:
+        api, _, settings = spec.partition(":")
+        if api not in APIS:
+            raise SystemExit(f"--api: unknown API {api!r} (one of {', '.join(APIS)})")
+        for setting in settings.split(","):
+            key, _, value = setting.partition("=")
+            faults.setdefault(api, {})[key] = float(value)
+    return faults
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--api", action="append", help="per-API faults, e.g. wikipedia:error_rate=1,latency_ms=500")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the fault RNG")
+    parser.add_argument("--strict", action="store_true", help="404 for Wikipedia articles that weren't recorded")
+    parser.add_argument("--record", action="store_true", help="capture fresh responses from the real APIs and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        return record()
+    faults = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+              "timeout_rate": args.timeout_rate, **parse_api_faults(args.api)}
+    server = StubUpstream(args.host, args.port, faults=faults, seed=args.seed, strict=args.strict)
+    print(f"Stub upstream on {server.url} - run the app with TGTA_UPSTREAM_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
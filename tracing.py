@@ -0,0 +1,103 @@
+"""
+🔬 MATCH TRACING
+Which tiers ran for a query, how long each took, what they found and which answer won
+Off unless TGTA_TRACE is set or a block runs inside trace_matches()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# TGTA_TRACE=1 prints one JSON record per search to stderr
+TRACE_TO_STDERR = os.environ.get("TGTA_TRACE", "") not in ("", "0")
+
+_STATE = threading.local()  # Streamlit runs each session's script in its own thread
+_LOCK = threading.Lock()
+_OPEN_BLOCKS = 0
+
+# Checked before anything else, so searches pay one attribute lookup while tracing is off
+enabled = TRACE_TO_STDERR
+
+
+class MatchTrace:
+    """Timings and candidates of one search, stage by stage."""
+
+    def __init__(self, query: str, k: int):
+        self.query = query
+        self.k = k
+        self.normalized = None
+        self.corrected = None
+        self.stages = []
+        self.stopped_after = None
+        self.results = []
+        self.total_ms = 0.0
+        self._start = self._last = time.perf_counter()
+        self._seen = {}
+
+    def stage(self, name: str, candidates: dict):
+        """Close a matcher stage: its time, and the candidates it added or improved.
+
+        candidates is the matcher's {key: (tier rank, -confidence, order, tier, confidence)}.
+        """
+        now = time.perf_counter()
+        found = [
+            {"key": key, "tier": entry[3], "confidence": entry[4]}
+            for key, entry in candidates.items() if self._seen.get(key) != entry
+        ]
+        self._seen = dict(candidates)
+        self.stages.append({"stage": name, "ms": round((now - self._last) * 1000, 4), "candidates": found})
+        self._last = now
+
+    def finish(self, results):
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        self.results = [{"key": r["matched"], "tier": r["tier"], "confidence": r["confidence"]} for r in results]
+        if TRACE_TO_STDERR:
+            print(json.dumps(self.to_dict(), ensure_ascii=False), file=sys.stderr)
+
+    @property
+    def winner(self):
+        return self.results[0] if self.results else None
+
+    def to_dict(self) -> dict:
+        return {
+            "query": self.query, "normalized": self.normalized, "corrected": self.corrected, "k": self.k,
+            "stages": self.stages, "stopped_after": self.stopped_after,
+            "winner": self.winner, "results": self.results, "total_ms": round(self.total_ms, 4),
+        }
+
+
+def start_trace(query: str, k: int):
+    """A new trace if tracing is on for this thread, else None (check `enabled` first)."""
+    collected = getattr(_STATE, "collected", None)
+    if collected is None and not TRACE_TO_STDERR:
+        return None
+    trace = MatchTrace(query, k)
+    if collected is not None:
+        collected.append(trace)
+    return trace
+
+
+@contextmanager
+def trace_matches():
+    """Trace every search run in this thread inside the block.
+
+        with trace_matches() as traces:
+            get_smart_answer("ferry to barra")
+        traces[0].to_dict()
+    """
+    global enabled, _OPEN_BLOCKS
+    previous = getattr(_STATE, "collected", None)
+    _STATE.collected = traces = []
+    with _LOCK:
+        _OPEN_BLOCKS += 1
+        enabled = True
+    try:
+        yield traces
+    finally:
+        _STATE.collected = previous
+        with _LOCK:
+            _OPEN_BLOCKS -= 1
+            enabled = TRACE_TO_STDERR or _OPEN_BLOCKS > 0
@@ -0,0 +1,325 @@
+"""
+📚 WIKIPEDIA LOOKUPS
+The fallback when the knowledge base has no answer: a Gambia article summary from Wikipedia
+Each query resolves to at most one article, served from a local snapshot of every mapped
+article that is refreshed in the background; an article missing from it costs one short
+request, shared by every search that wants it at the same time
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: processes may refresh the snapshot at the same time
+    fcntl = None
+
+import http_client
+from cache import SingleFlight, TTLCache
+from response_cache import API_CACHE
+from knowledge_base import GAMBIA_WIKI_MAP, KNOWLEDGE_PATH, WIKI_ALIASES, normalize_query
+from search_index import KeywordAutomaton
+from tokenizer import terms
+
+WIKI_SUMMARY_URL = http_client.BASE_URLS["wikipedia"] + "/api/rest_v1/page/summary/{title}"
+WIKI_THUMBNAIL_MAX_BYTES = 512 * 1024  # bigger images are linked, not stored
+
+# The committed snapshot, read but never written by the app - filled by tools/prefetch_wiki.py
+SEED_PATH = KNOWLEDGE_PATH / "wikipedia.json"
+# What the app fetches itself is saved under state/, in a file of its own when Wikipedia is a
+# stand-in (tools/stub_upstream.py), so placeholder articles never pass for real ones
+TEST_UPSTREAM = bool(os.environ.get("TGTA_UPSTREAM_URL") or os.environ.get("TGTA_WIKIPEDIA_URL"))
+SNAPSHOT_PATH = Path(os.environ.get("TGTA_WIKI_SNAPSHOT", Path(__file__).parent / "state" /
+                                    ("wikipedia-test.json" if TEST_UPSTREAM else "wikipedia.json")))
+SNAPSHOT_MAX_AGE = 24 * 3600  # refresh articles older than this
+SNAPSHOT_CHECK_INTERVAL = 3600  # seconds between background staleness checks
+PREFETCH_WORKERS = 8
+MISSING_FETCH_TIMEOUT = (1.0, 2.0)  # (connect, read) seconds a search waits for an article not in the snapshot
+
+# article title -> True for articles that just failed to load; retried after a few minutes
+MISS_CACHE = TTLCache(maxsize=1024, ttl=600)
+
+
+class ArticleResolver:
+    """Picks the single most specific article for a query.
+
+    Every GAMBIA_WIKI_MAP key and alias is matched as whole words in one
+    pass; the longest one found, not counting stopwords, wins ("kunta
+    kinteh island" beats "kunta kinteh", "history of the gambia" picks
+    "history" over "the gambia"). If no key is in the query, a query of
+    three or more letters that is part of a key ("kinteh island") picks
+    the shortest such key.
+    """
+
+    MIN_PARTIAL = 3  # shorter queries ("a", "ba") would match almost every key
+
+    def __init__(self, articles: dict, aliases: dict):
+        self.titles = dict(articles)
+        for alias, key in aliases.items():
+            if key in articles and alias not in self.titles:
+                self.titles[alias] = articles[key]
+        # Padding with spaces makes the automaton match whole words only
+        self._automaton = KeywordAutomaton(f" {name} " for name in self.titles)
+        self._specificity = [len("".join(terms(name))) for name in self.titles]
+        self._by_length = sorted(self.titles, key=len)
+
+    def resolve_key(self, query: str):
+        """The map key or alias query resolves to, or None."""
+        q = normalize_query(query)
+        if not q:
+            return None
+        found = self._automaton.find_all(f" {q} ")
+        if found:
+            best = min(found, key=lambda i: (-self._specificity[i], i))
+            return self._automaton.keywords[best][1:-1]
+        if len(q) >= self.MIN_PARTIAL and terms(q):
+            padded = f" {q} "
+            for name in self._by_length:
+                if padded in f" {name} ":
+                    return name
+        return None
+
+    def resolve(self, query: str):
+        """The article title query resolves to, or None."""
+        key = self.resolve_key(query)
+        return self.titles[key] if key is not None else None
+
+
+_RESOLVER = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_resolver() -> ArticleResolver:
+    """The resolver, rebuilt if GAMBIA_WIKI_MAP or WIKI_ALIASES have changed."""
+    global _RESOLVER
+    version = (GAMBIA_WIKI_MAP.version, WIKI_ALIASES.version)
+    resolver = _RESOLVER
+    if resolver is None or resolver[0] != version:
+        with _RESOLVER_LOCK:
+            if _RESOLVER is None or _RESOLVER[0] != version:
+                _RESOLVER = (version, ArticleResolver(GAMBIA_WIKI_MAP, WIKI_ALIASES))
+            resolver = _RESOLVER
+    return resolver[1]
+
+
+def resolve_article(query: str):
+    """The one article title that best answers query, or None."""
+    return get_resolver().resolve(query)
+
+
+# =============================================================================
+# FETCHING
+# =============================================================================
+
+
+def fetch_summary(title: str, timeout=None, retries: int = None, thumbnail: bool = True):
+    """Fetch one article's summary and (if thumbnail) its thumbnail from Wikipedia, or None if that fails."""
+    try:
+        data = http_client.get_json(WIKI_SUMMARY_URL.format(title=title), timeout=timeout, retries=retries)
+    except http_client.UpstreamError:
+        return None
+    summary = {
+        "title": data.get("title", title.replace("_", " ")),
+        "summary": data.get("extract", ""),
+        "url": data.get("content_urls", {}).get("desktop", {}).get("page", f"https://en.wikipedia.org/wiki/{title}"),
+        "image": data.get("thumbnail", {}).get("source", ""),
+        "thumbnail": None,
+        "fetched_at": time.time(),
+    }
+    if summary["image"] and thumbnail:
+        try:
+            img = http_client.get(summary["image"])
+            if len(img.content) <= WIKI_THUMBNAIL_MAX_BYTES:
+                summary["thumbnail"] = img.content
+        except http_client.UpstreamError:
+            pass  # the page still shows, with the image linked from Wikipedia
+    return summary
+
+
+# =============================================================================
+# SNAPSHOT - what searches are answered from
+# =============================================================================
+
+
+def load_snapshot(path: Path = None) -> dict:
+    """{article title: summary} from a snapshot file; empty if there is none yet."""
+    try:
+        data = json.loads(Path(path or SNAPSHOT_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    articles = {}
+    for title, summary in data.get("articles", {}).items():
+        thumbnail = summary.get("thumbnail")
+        articles[title] = dict(summary, thumbnail=base64.b64decode(thumbnail) if thumbnail else None)
+    return articles
+
+
+def save_snapshot(articles: dict, path: Path = None):
+    """Write a snapshot file next to path and rename it into place."""
+    path = Path(path or SNAPSHOT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"articles": {
+        title: dict(summary, thumbnail=base64.b64encode(summary["thumbnail"]).decode("ascii") if summary.get("thumbnail") else None)
+        for title, summary in sorted(articles.items())
+    }}
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def snapshot_file_lock(path: Path = None):
+    """Hold an exclusive lock next to the snapshot file, so one process at a time refreshes it."""
+    path = Path(path or SNAPSHOT_PATH)
+    try:
+        if fcntl is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        lock = open(path.with_name(f"{path.name}.lock"), "a") if fcntl is not None else None
+    except OSError:  # read-only deploy: nothing is saved, so there is nothing to share
+        lock = None
+    if lock is None:
+        yield
+        return
+    with lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+SNAPSHOT = {}
+_SNAPSHOT_LOCK = threading.Lock()
+_FLIGHTS = SingleFlight()  # article title -> the one fetch of an article missing from the snapshot
+
+
+def mapped_titles() -> list:
+    return list(dict.fromkeys(GAMBIA_WIKI_MAP.values()))
+
+
+def _store(title: str, summary) -> bool:
+    if summary is None:
+        MISS_CACHE.set(title, True)
+        return False
+    with _SNAPSHOT_LOCK:
+        SNAPSHOT[title] = summary
+    return True
+
+
+def _merge(articles: dict) -> int:
+    """Take every article newer than our copy of it; returns how many were."""
+    with _SNAPSHOT_LOCK:
+        newer = {title: summary for title, summary in articles.items()
+                 if title not in SNAPSHOT or summary.get("fetched_at", 0) > SNAPSHOT[title].get("fetched_at", 0)}
+        SNAPSHOT.update(newer)
+    return len(newer)
+
+
+_merge(load_snapshot(SEED_PATH))
+_merge(load_snapshot())  # what this host has fetched since, newer than the seed
+
+
+def refresh_snapshot(titles=None, max_age: float = 0, path: Path = None, save: bool = True,
+                     workers: int = PREFETCH_WORKERS) -> dict:
+    """Fetch articles in parallel into SNAPSHOT and (if save) write it to disk.
+
+    The snapshot file is re-read first, under a lock shared with the other
+    worker processes, so articles another worker has just refreshed are
+    taken from it rather than fetched again. Only titles still missing or
+    older than max_age seconds are fetched; a failed fetch keeps the copy
+    already there. Returns {"fetched": n, "failed": [titles], "kept": n}.
+    """
+    titles = mapped_titles() if titles is None else list(titles)
+    with snapshot_file_lock(path):
+        _merge(load_snapshot(path))
+        now = time.time()
+        stale = [t for t in titles if t not in SNAPSHOT or not max_age or now - SNAPSHOT[t].get("fetched_at", 0) > max_age]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wiki-prefetch") as pool:
+            results = list(pool.map(fetch_summary, stale))
+        failed = [title for title, summary in zip(stale, results) if not _store(title, summary)]
+        if save and len(failed) < len(stale):
+            try:
+                save_snapshot(SNAPSHOT, path)
+            except OSError as e:  # read-only deploy: the refreshed copy lives in memory only
+                print(f"Wikipedia snapshot not saved: {e}")
+    return {"fetched": len(stale) - len(failed), "failed": failed, "kept": len(titles) - len(stale)}
+
+
+def _fetch_missing(title: str):
+    """One quick fetch of an article the snapshot doesn't have yet - no retries, no thumbnail."""
+    summary = SNAPSHOT.get(title)  # stored by a search that finished just before this one started
+    if summary is None:
+        summary = fetch_summary(title, timeout=MISSING_FETCH_TIMEOUT, retries=0, thumbnail=False)
+        if _store(title, summary):  # shared with other workers until the snapshot file has it
+            API_CACHE.set(f"wikipedia:{title}", summary, SNAPSHOT_MAX_AGE)
+    return summary
+
+
+_REFRESHER = None
+
+
+def start_snapshot_refresher(interval: float = SNAPSHOT_CHECK_INTERVAL, max_age: float = SNAPSHOT_MAX_AGE) -> threading.Thread:
+    """Start (once per process) a thread that keeps the snapshot complete and fresh."""
+    global _REFRESHER
+    with _SNAPSHOT_LOCK:
+        if _REFRESHER is None or not _REFRESHER.is_alive():
+            def refresh():
+                while True:
+                    try:
+                        result = refresh_snapshot(max_age=max_age)
+                        if result["failed"]:
+                            print(f"Wikipedia snapshot: {len(result['failed'])} articles could not be refreshed")
+                    except Exception as e:  # keep serving the old snapshot
+                        print(f"Wikipedia snapshot refresh failed: {e}")
+                    time.sleep(interval)
+            _REFRESHER = threading.Thread(target=refresh, name="wiki-refresher", daemon=True)
+            _REFRESHER.start()
+    return _REFRESHER
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+
+def get_summary(title: str):
+    """An article from the snapshot, or None if it can't be loaded.
+
+    An article missing from the snapshot (and from the API cache other
+    workers share) is fetched there and then, with a short timeout; searches
+    wanting it at the same time wait for that one request. After a failure
+    it isn't tried again until MISS_CACHE forgets it.
+    """
+    summary = SNAPSHOT.get(title)
+    if summary is None:
+        entry = API_CACHE.get(f"wikipedia:{title}")  # fetched by another worker
+        if entry is not None:
+            summary = entry["value"]
+            _store(title, summary)
+        elif title not in MISS_CACHE:
+            summary = _FLIGHTS.do(title, _fetch_missing, title)
+    if summary is None:
+        return None
+    return {
+        "title": summary["title"], "summary": summary["summary"], "url": summary["url"],
+        "image": summary.get("thumbnail") or summary.get("image", ""), "success": True,
+    }
+
+
+def search_gambia_wikipedia(query: str) -> dict:
+    """Search Wikipedia for Gambia-related topics - answered from the local snapshot.
+
+    With no success, "unavailable" tells apart an article that couldn't be
+    loaded just now (its title and url are filled in) from no article at all.
+    """
+    title = resolve_article(query)
+    if title is None:
+        return {"success": False, "title": query, "summary": "", "url": "", "image": ""}
+    summary = get_summary(title)
+    if summary is None:
+        return {"success": False, "unavailable": True, "title": title.replace("_", " "), "summary": "",
+                "url": f"https://en.wikipedia.org/wiki/{title}", "image": ""}
+    return summary